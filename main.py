@@ -16,14 +16,16 @@ from collections import Counter
 from dataclasses import dataclass
 from pathlib import Path
 
+import orjson
+
 from src.config.settings import settings
 from src.logger import setup_logging, get_logger
 from src.db.connection import check_connection, get_session, init_schema
 from src.db.repository import ArticleRepository, DecisionRepository
 from src.db.models import DecisionCreate
 from src.ingestion.pipeline import IngestionPipeline
-from src.retrieval.hybrid import HybridRetriever
-from src.retrieval.reranker import LLMReranker
+from src.retrieval.hybrid import HybridRetriever, get_default_retriever
+from src.retrieval.reranker import LLMReranker, get_default_reranker
 from src.retrieval.models import RetrievalResult, RankedResult
 from src.novelty.detector import NoveltyDetector
 from src.novelty.models import Decision
@@ -31,6 +33,9 @@ from src.novelty.models import Decision
 setup_logging()
 logger = get_logger("main")
 
+# orjson handles datetimes, enums and numpy natively (no default=str reflection).
+JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+
 
 @dataclass
 class Dependencies:
@@ -40,7 +45,13 @@ class Dependencies:
 
 
 # TASK 1
-def get_top_k_similar(text: str, top_k: int = 5, retriever: HybridRetriever | None = None) -> list[RetrievalResult]:
+def get_top_k_similar(
+    text: str,
+    top_k: int = 5,
+    *,
+    retriever: HybridRetriever,
+    top_k_pool: int | None = None,
+) -> list[RetrievalResult]:
     """
     Return the top-k most similar articles for a given input text.
 
@@ -48,9 +59,11 @@ def get_top_k_similar(text: str, top_k: int = 5, retriever: HybridRetriever | No
         1. Semantic search (pgvector cosine similarity)
         2. Keyword search (Postgres tsvector)
         3. RRF fusion of both ranked lists
+
+    top_k_pool widens each search (e.g. 4 * top_k) before fusion; defaults to top_k.
+    Library callers without their own retriever can pass get_default_retriever().
     """
-    retriever = retriever or HybridRetriever()
-    candidates = retriever.retrieve(text, top_k=top_k)
+    candidates = retriever.retrieve(text, top_k=top_k, pool_size=top_k_pool)
     return candidates[:top_k]
 
 
@@ -85,21 +98,22 @@ def run_task2(incoming_path: Path, deps: Dependencies):
     print(f" TASK 2: Publish/Skip Decisions ({len(articles)} articles)")
     print(f"{'='*70}\n")
 
-    results = []
-    for i, text in enumerate(articles, 1):
-        result = detector.assess(text)
-        results.append(result)
+    results = detector.assess_batch(articles)
 
-        with get_session() as session:
-            DecisionRepository(session).save(DecisionCreate(
+    with get_session() as session:
+        DecisionRepository(session).save_batch([
+            DecisionCreate(
                 incoming_text=result.incoming_text,
                 decision=result.decision.value,
                 confidence=result.confidence,
                 reasoning=result.reasoning,
                 top_match_id=result.top_match_id,
                 top_match_similarity=result.top_match_similarity,
-            ))
+            )
+            for result in results
+        ])
 
+    for i, result in enumerate(results, 1):
         print(f"  [{result.decision.value}] Article {i} (confidence: {result.confidence:.2f})")
         print(f"     {result.reasoning}")
         if result.new_information:
@@ -114,8 +128,9 @@ def run_task2(incoming_path: Path, deps: Dependencies):
     # Save results
     output_path = Path(settings.output_dir) / "task2_decisions.json"
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w") as f:
-        json.dump([r.model_dump() for r in results], f, indent=2, default=str)
+    output_path.write_bytes(
+        orjson.dumps([r.model_dump() for r in results], option=JSON_OPTIONS)
+    )
     logger.info("task2_saved", path=str(output_path))
 
     return results
@@ -140,8 +155,10 @@ def run_task3():
         print(f"  [{r.decision}] Decision #{r.id} (confidence: {r.confidence:.2f})")
         print(f"     Text: {r.incoming_text[:200]}...")
         print(f"     Reasoning: {r.reasoning}")
-        if r.top_match_id:
+        if r.top_match_id and r.top_match_similarity is not None:
             print(f"     Matched article #{r.top_match_id} (similarity: {r.top_match_similarity:.2f})")
+        elif r.top_match_id:
+            print(f"     Matched article #{r.top_match_id}")
         if r.created_at:
             print(f"     Recorded: {r.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
         print()
@@ -176,8 +193,7 @@ def run_task3():
 
     output_path = Path(settings.output_dir) / "task3_analysis.json"
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w") as f:
-        json.dump(report, f, indent=2, default=str)
+    output_path.write_bytes(orjson.dumps(report, option=JSON_OPTIONS))
     logger.info("task3_saved", path=str(output_path))
 
     return records
@@ -203,8 +219,8 @@ def main():
     logger.info("ready", articles=count)
 
     deps = Dependencies(
-        retriever=HybridRetriever(),
-        reranker=LLMReranker(),
+        retriever=get_default_retriever(),
+        reranker=get_default_reranker(),
     )
 
     run_all = args.task is None
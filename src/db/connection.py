@@ -1,9 +1,14 @@
 """Database session management and schema initialization."""
 
 from contextlib import contextmanager
+from functools import lru_cache
 from typing import Generator
 
-from sqlalchemy import create_engine, text
+import numpy as np
+from pgvector.psycopg2 import register_vector
+from psycopg2 import ProgrammingError
+from psycopg2.extensions import QuotedString, register_adapter
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker, Session
 
 from src.config.settings import settings
@@ -12,10 +17,56 @@ from src.logger import get_logger
 
 logger = get_logger(__name__)
 
-engine = create_engine(settings.database_url, pool_pre_ping=True, pool_size=5)
+engine = create_engine(
+    settings.database_url,
+    pool_pre_ping=True,
+    pool_size=settings.db_pool_size,
+    pool_recycle=settings.db_pool_recycle_seconds,
+)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
 
+@lru_cache(maxsize=8)
+def _vec_format(dim: int) -> str:
+    return "[" + ",".join(["%.9g"] * dim) + "]"
+
+
+def vec_literal(embedding: np.ndarray) -> str:
+    """pgvector text form '[0.1,0.2,...]'; 9 significant digits round-trip fp32."""
+    arr = np.asarray(embedding, dtype=np.float32).ravel()
+    return _vec_format(arr.size) % tuple(arr.tolist())
+
+
+class _VectorLiteral:
+    """
+    psycopg2 adapter binding numpy arrays as pgvector literals.
+
+    psycopg2 only sends text binds, and pgvector's own adapter writes each
+    float32 as a float64 repr (0.10000000149011612); 9 significant digits are
+    enough to read back the exact float32, so single-row writes match the
+    binary COPY path, at roughly two thirds of the bytes.
+    """
+
+    def __init__(self, value: np.ndarray):
+        self._value = value
+
+    def getquoted(self) -> bytes:
+        return QuotedString(vec_literal(self._value)).getquoted()
+
+
+@event.listens_for(engine, "connect")
+def _register_vector(dbapi_connection, connection_record) -> None:
+    """Bind numpy arrays as pgvector values and parse vector columns on read."""
+    try:
+        register_vector(dbapi_connection)
+    except ProgrammingError:
+        # Extension not created yet (fresh database). init_schema creates it
+        # and disposes the pool, so later connections register properly.
+        dbapi_connection.rollback()
+    # register_vector installs its own (global) ndarray adapter; replace it.
+    register_adapter(np.ndarray, _VectorLiteral)
+
+
 @contextmanager
 def get_session() -> Generator[Session, None, None]:
     """
@@ -39,7 +90,8 @@ def init_schema() -> None:
     Create extensions and tables.
 
     Vector dimension is read from settings. Make sure it matches the embedding provider's output.
-    For future: index creation can be added here as well (in case we have more data).
+    Indexes: GIN on tsv for keyword search. The HNSW index is built after the
+    initial load (create_vector_index), not row by row during the bulk COPY.
     """
     dim = settings.embedding_dimension
 
@@ -52,11 +104,28 @@ def init_schema() -> None:
                 id SERIAL PRIMARY KEY,
                 text TEXT NOT NULL,
                 embedding vector({dim}),
+                embedding_i8 BYTEA,
+                embedding_scale REAL,
                 tsv tsvector GENERATED ALWAYS AS (to_tsvector('english', text)) STORED
             )
         """
             )
         )
+        # int8 copy of embedding (row ≈ embedding_i8 * embedding_scale) for
+        # in-process SIMD search; added separately for databases created earlier.
+        session.execute(
+            text(
+                "ALTER TABLE articles "
+                "ADD COLUMN IF NOT EXISTS embedding_i8 BYTEA, "
+                "ADD COLUMN IF NOT EXISTS embedding_scale REAL"
+            )
+        )
+        session.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS articles_tsv_gin "
+                "ON articles USING GIN (tsv)"
+            )
+        )
         session.execute(
             text(
                 """
@@ -74,9 +143,33 @@ def init_schema() -> None:
             )
         )
 
+    # Connections opened before the extension existed have no vector adapter.
+    engine.dispose()
+
     logger.info("schema_initialized", embedding_dimension=dim)
 
 
+def create_vector_index() -> None:
+    """
+    HNSW (cosine) index on embeddings for semantic search.
+
+    pgvector builds the graph much faster over loaded rows than by inserting
+    them one at a time, so ingestion calls this after its bulk load. No-op if
+    the index exists.
+    """
+    with get_session() as session:
+        session.execute(
+            text(
+                f"""
+            CREATE INDEX IF NOT EXISTS articles_embedding_hnsw ON articles
+            USING hnsw (embedding vector_cosine_ops)
+            WITH (m = {settings.hnsw_m}, ef_construction = {settings.hnsw_ef_construction})
+        """
+            )
+        )
+    logger.info("vector_index_ready")
+
+
 def check_connection() -> bool:
     try:
         with get_session() as session:
@@ -1,24 +1,34 @@
 """Database domain models."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
+from typing import NamedTuple
+
+import numpy as np
 
 
 class ArticleCreate(BaseModel):
-    """Payload for inserting a new article."""
+    """Payload for inserting a new article. embedding is a 1-D float32 array."""
 
     text: str = Field(..., min_length=1)
-    embedding: list[float] = Field(..., min_length=1)
+    embedding: np.ndarray
 
+    model_config = {"arbitrary_types_allowed": True}
 
-class ArticleRecord(BaseModel):
-    """An article row returned from the database."""
+    @field_validator("embedding", mode="before")
+    @classmethod
+    def _as_float32(cls, v) -> np.ndarray:
+        v = np.asarray(v, dtype=np.float32)
+        if v.ndim != 1 or v.size == 0:
+            raise ValueError("embedding must be a non-empty 1-D vector")
+        return v
 
-    id: int
-    text: str
-    score: float = 0.0
 
-    model_config = {"frozen": True}
+class ArticleHit(NamedTuple):
+    """A search hit: id and score only, the article text is fetched separately."""
+
+    id: int
+    score: float
 
 
 class DecisionCreate(BaseModel):
@@ -1,29 +1,81 @@
 """Repository layer: all SQL operations isolated here"""
 
+import io
+import struct
+from typing import Sequence
+
+import numpy as np
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
-from src.db.models import ArticleCreate, ArticleRecord, DecisionCreate, DecisionRecord
+from src.config.settings import settings
+from src.db.models import ArticleCreate, ArticleHit, DecisionCreate, DecisionRecord
 from src.logger import get_logger
+from src.services.quantize import quantize_i8
 
 logger = get_logger(__name__)
 
+# Binary COPY framing: signature + flags + header extension length, and the -1 trailer.
+_PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_PGCOPY_TRAILER = struct.pack(">h", -1)
+
+
+def _as_vector(embedding: np.ndarray | Sequence[float]) -> np.ndarray:
+    """float32 array (no copy if it already is one), bound via connection.vec_literal."""
+    return np.asarray(embedding, dtype=np.float32)
+
+
+def _copy_binary(articles: list[ArticleCreate]) -> io.BytesIO:
+    """
+    Encode (text, embedding, embedding_i8, embedding_scale) rows in COPY BINARY format.
+
+    Vectors use pgvector's wire format (int16 dim, int16 unused, big-endian float4s),
+    so the server never parses float text.
+    """
+    buf = io.BytesIO()
+    buf.write(_PGCOPY_HEADER)
+    for a in articles:
+        text_bytes = a.text.encode()
+        vec = np.asarray(a.embedding, dtype=">f4")
+        quantized, scale = quantize_i8(vec)
+        buf.write(struct.pack(">hi", 4, len(text_bytes)))
+        buf.write(text_bytes)
+        buf.write(struct.pack(">ihh", 4 + vec.nbytes, vec.size, 0))
+        buf.write(vec.tobytes())
+        buf.write(struct.pack(">i", quantized.nbytes))
+        buf.write(quantized.tobytes())
+        buf.write(struct.pack(">if", 4, scale[0]))
+    buf.write(_PGCOPY_TRAILER)
+    buf.seek(0)
+    return buf
+
 
 class ArticleRepository:
     """
     Repository for managing article records in the database.
+
+    Rows read back come from our own schema, so records are built with
+    model_construct (no validation pass). Searches return id/score hits only;
+    article bodies are fetched separately, for the results actually kept.
     """
 
     def __init__(self, session: Session):
         self.session = session
 
     def insert(self, article: ArticleCreate) -> int:
+        embedding = _as_vector(article.embedding)
+        quantized, scale = quantize_i8(embedding)
         result = self.session.execute(
             text(
-                "INSERT INTO articles (text, embedding) "
-                "VALUES (:text, :embedding) RETURNING id"
+                "INSERT INTO articles (text, embedding, embedding_i8, embedding_scale) "
+                "VALUES (:text, :embedding, :embedding_i8, :embedding_scale) RETURNING id"
             ),
-            {"text": article.text, "embedding": str(article.embedding)},
+            {
+                "text": article.text,
+                "embedding": embedding,
+                "embedding_i8": quantized.tobytes(),
+                "embedding_scale": float(scale[0]),
+            },
         )
         return result.scalar_one()
 
@@ -33,39 +85,166 @@ class ArticleRepository:
         logger.info("batch_inserted", count=len(ids))
         return ids
 
+    def insert_batch_copy(self, articles: list[ArticleCreate]) -> int:
+        """
+        Bulk insert via COPY FROM STDIN: one round-trip for the whole batch.
+
+        Ids are not returned (ingestion doesn't need them), only the row count.
+        """
+        cursor = self.session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                "COPY articles (text, embedding, embedding_i8, embedding_scale) "
+                "FROM STDIN WITH (FORMAT BINARY)",
+                _copy_binary(articles),
+            )
+        finally:
+            cursor.close()
+
+        logger.info("batch_copied", count=len(articles))
+        return len(articles)
+
     def count(self) -> int:
         return self.session.execute(text("SELECT COUNT(*) FROM articles")).scalar_one()
 
-    def search_semantic(
-        self, embedding: list[float], limit: int
-    ) -> list[ArticleRecord]:
-        """Cosine similarity via pgvector."""
+    def any(self) -> bool:
+        """True if at least one article exists (stops at the first row)."""
+        return (
+            self.session.execute(text("SELECT 1 FROM articles LIMIT 1")).first()
+            is not None
+        )
+
+    def estimate_count(self) -> int:
+        """
+        Planner row estimate from pg_class (no table scan).
+
+        Falls back to COUNT(*) if the table has never been analyzed (reltuples = -1).
+        """
+        estimate = self.session.execute(
+            text(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = 'articles'::regclass"
+            )
+        ).scalar_one()
+        return estimate if estimate >= 0 else self.count()
+
+    def fetch_embeddings_i8(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        All article ids with int8-quantized embeddings, for in-process SIMD search.
+
+        Reads the compact embedding_i8 column (1 byte/dim, no float parsing).
+        Rows written before that column existed are quantized here from embedding.
+
+        :return: (ids, int8 matrix, per-row float32 scales)
+        """
         result = self.session.execute(
             text(
-                "SELECT id, text, 1 - (embedding <=> :embedding) AS score "
+                "SELECT id, embedding_i8, embedding_scale, "
+                "CASE WHEN embedding_i8 IS NULL THEN embedding END AS embedding "
+                "FROM articles WHERE embedding IS NOT NULL ORDER BY id"
+            )
+        )
+        rows = result.mappings().all()
+
+        dim = settings.embedding_dimension
+        ids = np.fromiter((m["id"] for m in rows), dtype=np.int64, count=len(rows))
+        matrix = np.empty((len(rows), dim), dtype=np.int8)
+        scales = np.empty(len(rows), dtype=np.float32)
+        for i, m in enumerate(rows):
+            if m["embedding_i8"] is None:
+                quantized, scale = quantize_i8(m["embedding"])
+                matrix[i], scales[i] = quantized[0], scale[0]
+            else:
+                matrix[i] = np.frombuffer(m["embedding_i8"], dtype=np.int8)
+                scales[i] = m["embedding_scale"]
+        return ids, matrix, scales
+
+    def search_semantic(self, embedding: np.ndarray, limit: int) -> list[ArticleHit]:
+        """Cosine similarity via pgvector (HNSW index, approximate)."""
+        self._set_ef_search(limit)
+        result = self.session.execute(
+            text(
+                "SELECT id, 1 - (embedding <=> :embedding) AS score "
                 "FROM articles ORDER BY embedding <=> :embedding LIMIT :limit"
             ),
-            {"embedding": str(embedding), "limit": limit},
+            {"embedding": _as_vector(embedding), "limit": limit},
         )
-        return [
-            ArticleRecord(id=r.id, text=r.text, score=r.score)
-            for r in result.fetchall()
-        ]
+        return [ArticleHit._make(r) for r in result.tuples().all()]
 
-    def search_keyword(self, query: str, limit: int) -> list[ArticleRecord]:
+    def search_semantic_batch(
+        self, embeddings: np.ndarray, limit: int
+    ) -> list[list[ArticleHit]]:
+        """search_semantic for many embeddings in one round-trip (LATERAL join)."""
+        self._set_ef_search(limit)
+        result = self.session.execute(
+            text(
+                "SELECT q.ord, a.id, a.score "
+                "FROM unnest(CAST(:embeddings AS vector[])) WITH ORDINALITY AS q(embedding, ord) "
+                "CROSS JOIN LATERAL ("
+                "  SELECT id, 1 - (articles.embedding <=> q.embedding) AS score "
+                "  FROM articles ORDER BY articles.embedding <=> q.embedding LIMIT :limit"
+                ") a "
+                "ORDER BY q.ord, a.score DESC"
+            ),
+            {"embeddings": [_as_vector(e) for e in embeddings], "limit": limit},
+        )
+        return self._group_by_ordinal(result.tuples().all(), len(embeddings))
+
+    def search_keyword(self, query: str, limit: int) -> list[ArticleHit]:
         """Full-text search via tsvector."""
         result = self.session.execute(
             text(
-                "SELECT id, text, ts_rank(tsv, plainto_tsquery('english', :query)) AS score "
+                "SELECT id, ts_rank(tsv, plainto_tsquery('english', :query)) AS score "
                 "FROM articles WHERE tsv @@ plainto_tsquery('english', :query) "
                 "ORDER BY score DESC LIMIT :limit"
             ),
             {"query": query, "limit": limit},
         )
-        return [
-            ArticleRecord(id=r.id, text=r.text, score=r.score)
-            for r in result.fetchall()
-        ]
+        return [ArticleHit._make(r) for r in result.tuples().all()]
+
+    def search_keyword_batch(
+        self, queries: list[str], limit: int
+    ) -> list[list[ArticleHit]]:
+        """search_keyword for many queries in one round-trip (LATERAL per query)."""
+        result = self.session.execute(
+            text(
+                "SELECT q.ord, a.id, a.score "
+                "FROM unnest(CAST(:queries AS text[])) WITH ORDINALITY AS q(query, ord) "
+                "CROSS JOIN LATERAL ("
+                "  SELECT id, ts_rank(tsv, plainto_tsquery('english', q.query)) AS score "
+                "  FROM articles WHERE tsv @@ plainto_tsquery('english', q.query) "
+                "  ORDER BY score DESC LIMIT :limit"
+                ") a "
+                "ORDER BY q.ord, a.score DESC"
+            ),
+            {"queries": list(queries), "limit": limit},
+        )
+        return self._group_by_ordinal(result.tuples().all(), len(queries))
+
+    def fetch_texts(self, ids: list[int]) -> dict[int, str]:
+        """Article bodies for the given ids (one round-trip; missing ids are absent)."""
+        if not ids:
+            return {}
+        result = self.session.execute(
+            text("SELECT id, text FROM articles WHERE id = ANY(:ids)"),
+            {"ids": list(ids)},
+        )
+        return dict(result.tuples().all())
+
+    def _set_ef_search(self, limit: int) -> None:
+        # SET LOCAL can't take bind params; set_config(..., true) is the equivalent.
+        self.session.execute(
+            text("SELECT set_config('hnsw.ef_search', :ef, true)"),
+            {"ef": str(max(settings.hnsw_ef_search, 2 * limit))},
+        )
+
+    @staticmethod
+    def _group_by_ordinal(rows, n: int) -> list[list[ArticleHit]]:
+        """Split (ord, id, score) rows into one list per input; ord is 1-based."""
+        grouped: list[list[ArticleHit]] = [[] for _ in range(n)]
+        for ord_, article_id, score in rows:
+            grouped[ord_ - 1].append(ArticleHit(article_id, score))
+        return grouped
 
 
 class DecisionRepository:
@@ -84,6 +263,30 @@ class DecisionRepository:
         )
         return result.scalar_one()
 
+    def save_batch(self, records: list[DecisionCreate]) -> list[int]:
+        """Insert many decisions in one statement (one array per column, unnested)."""
+        if not records:
+            return []
+        columns = {
+            name: [getattr(r, name) for r in records]
+            for name in DecisionCreate.model_fields
+        }
+        result = self.session.execute(
+            text(
+                "INSERT INTO decisions "
+                "(incoming_text, decision, confidence, reasoning, top_match_id, top_match_similarity) "
+                "SELECT * FROM unnest("
+                "CAST(:incoming_text AS text[]), CAST(:decision AS text[]), "
+                "CAST(:confidence AS float8[]), CAST(:reasoning AS text[]), "
+                "CAST(:top_match_id AS int[]), CAST(:top_match_similarity AS float8[])"
+                ") RETURNING id"
+            ),
+            columns,
+        )
+        ids = list(result.scalars().all())
+        logger.info("decisions_saved", count=len(ids))
+        return ids
+
     def fetch_all(self) -> list[DecisionRecord]:
         """Retrieve all recorded decisions, most recent first."""
         result = self.session.execute(
@@ -93,16 +296,4 @@ class DecisionRepository:
                 "FROM decisions ORDER BY created_at DESC"
             )
         )
-        return [
-            DecisionRecord(
-                id=r.id,
-                incoming_text=r.incoming_text,
-                decision=r.decision,
-                confidence=r.confidence,
-                reasoning=r.reasoning,
-                top_match_id=r.top_match_id,
-                top_match_similarity=r.top_match_similarity,
-                created_at=r.created_at,
-            )
-            for r in result.fetchall()
-        ]
+        return [DecisionRecord.model_construct(**m) for m in result.mappings().all()]
@@ -1,9 +1,12 @@
 """Ingestion pipeline: CSV -> embeddings -> Postgres."""
 
-import pandas as pd
+import re
 from pathlib import Path
 
-from src.db.connection import get_session
+import pyarrow as pa
+import pyarrow.csv as pv
+
+from src.db.connection import create_vector_index, get_session
 from src.db.repository import ArticleRepository
 from src.db.models import ArticleCreate
 from src.services.embedding import BaseEmbeddingService, create_embedding_service
@@ -11,6 +14,10 @@ from src.logger import get_logger
 
 logger = get_logger(__name__)
 
+_CITATION_RE = re.compile(r"\[\d+\]")  # [1], [2], etc.
+_EMPHASIS_RE = re.compile(r"\*{1,2}(.+?)\*{1,2}")  # **bold**, *italic*
+_WHITESPACE_RE = re.compile(r"\s+")
+
 
 class IngestionPipeline:
     """
@@ -26,39 +33,67 @@ class IngestionPipeline:
         if not csv_path.exists():
             raise FileNotFoundError(f"CSV not found: {csv_path}")
 
-        df = pd.read_csv(csv_path)
-        if "text" not in df.columns:
-            raise ValueError("CSV must contain a 'text' column")
-
-        texts = df["text"].dropna().tolist()
-        texts = [self._clean_text(t) for t in texts]
+        texts = self._read_texts(csv_path)
         logger.info("csv_loaded", count=len(texts))
 
         with get_session() as session:
             repo = ArticleRepository(session)
-            existing = repo.count()
-            if existing > 0:
-                logger.info("already_ingested", count=existing)
-                return existing
+            ingested = repo.any()
+            existing = repo.estimate_count() if ingested else 0
+        if ingested:
+            # Also covers a previous run that stopped between COPY and indexing.
+            create_vector_index()
+            logger.info("already_ingested", count=existing)
+            return existing
 
+        # Embed with no session open: the API calls can take minutes, and a
+        # pooled connection left idle in transaction meanwhile may be killed.
         embeddings = self.embedding_service.embed_batch(texts)
         articles = [
             ArticleCreate(text=t, embedding=e) for t, e in zip(texts, embeddings)
         ]
-
         with get_session() as session:
-            repo = ArticleRepository(session)
-            repo.insert_batch(articles)
+            ArticleRepository(session).insert_batch_copy(articles)
+        create_vector_index()
 
         logger.info("ingestion_complete", count=len(articles))
         return len(articles)
 
+    @classmethod
+    def _read_texts(cls, csv_path: Path, block_size: int | None = None) -> list[str]:
+        """
+        Cleaned, non-null values of the CSV's text column.
+
+        Articles contain quoted multi-line values, which pyarrow only splits
+        correctly across read blocks with newlines_in_values.
+        """
+        read_options = pv.ReadOptions()
+        if block_size is not None:
+            read_options.block_size = block_size
+        try:
+            table = pv.read_csv(
+                csv_path,
+                read_options=read_options,
+                parse_options=pv.ParseOptions(newlines_in_values=True),
+                convert_options=pv.ConvertOptions(
+                    include_columns=["text"],
+                    column_types={"text": pa.string()},
+                    strings_can_be_null=True,
+                ),
+            )
+        except pa.ArrowKeyError:
+            raise ValueError("CSV must contain a 'text' column")
+
+        return [
+            cls._clean_text(t)
+            for t in table.column("text").to_pylist()
+            if t is not None
+        ]
+
     @staticmethod
     def _clean_text(text: str) -> str:
-        import re
-
         text = text.strip().strip('"').strip()
-        text = re.sub(r"\[\d+\]", "", text)  # [1], [2], etc.
-        text = re.sub(r"\*{1,2}(.+?)\*{1,2}", r"\1", text)  # **bold**, *italic*
-        text = " ".join(text.split())
+        text = _CITATION_RE.sub("", text)
+        text = _EMPHASIS_RE.sub(r"\1", text)
+        text = _WHITESPACE_RE.sub(" ", text).strip()
         return text
@@ -2,23 +2,40 @@
 Novelty detector. Task 2.
 
 Pipeline:
+    0. In-process cosine pre-filter: a near-identical article becomes the only
+       candidate, replacing step 1 (the LLM still checks it for status changes)
     1. Hybrid retrieval (reuses Task 1)
     2. LLM reranking -> truly relevant matches. (Refer to retrieval/reranker.py and retrieval/prompts.py for implementation details)
     3. No relevant matches -> auto PUBLISH (new topic)
     4. Relevant matches -> LLM novelty assessment -> PUBLISH / SKIP / REVIEW (in case of low confidence or errors)
 """
 
+import asyncio
+
+import numpy as np
+
 from src.config.settings import settings
+from src.db.connection import get_session
+from src.db.repository import ArticleRepository
 from src.novelty.models import Decision, NoveltyResponse, NoveltyResult
-from src.novelty.prompts import NOVELTY_SYSTEM_PROMPT, NOVELTY_ASSESSMENT_PROMPT
-from src.retrieval.hybrid import HybridRetriever
-from src.retrieval.reranker import LLMReranker
-from src.retrieval.models import RankedResult
-from src.services.llm import LLMClient
+from src.novelty.prompts import (
+    NOVELTY_ASSESSMENT_PROMPT,
+    NOVELTY_SYSTEM_PROMPT,
+    render_novelty_prompt,
+)
+from src.retrieval.hybrid import HybridRetriever, get_default_retriever
+from src.retrieval.reranker import LLMReranker, get_default_reranker
+from src.retrieval.simd import topk
+from src.retrieval.models import RankedResult, RetrievalResult
+from src.services.cache import SemanticCache, content_key
+from src.services.llm import AsyncLLMClient, LLMClient, close_async_openai_clients
 from src.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Cached decisions are only valid for the prompts that produced them.
+_PROMPT_VERSION = content_key(NOVELTY_SYSTEM_PROMPT, NOVELTY_ASSESSMENT_PROMPT)[:8]
+
 
 class NoveltyDetector:
     def __init__(
@@ -26,93 +43,301 @@ class NoveltyDetector:
         retriever: HybridRetriever | None = None,
         reranker: LLMReranker | None = None,
         llm_client: LLMClient | None = None,
+        async_llm_client: AsyncLLMClient | None = None,
+        cache: SemanticCache | None = None,
     ):
-        self.retriever = retriever or HybridRetriever()
-        self.reranker = reranker or LLMReranker()
+        self.retriever = retriever or get_default_retriever()
+        self.reranker = reranker or get_default_reranker()
         self.llm = llm_client or LLMClient()
+        self.async_llm = async_llm_client or AsyncLLMClient()
+        self.cache = cache or SemanticCache("novelty")
         self.confidence_threshold = settings.novelty_confidence_threshold
+        self.duplicate_threshold = settings.novelty_duplicate_threshold
+        self._article_ids: np.ndarray | None = None
+        self._article_matrix: np.ndarray | None = None
+
+    def refresh_index(self) -> tuple[np.ndarray, np.ndarray]:
+        """(Re)load article embeddings for the pre-filter. Call after ingestion."""
+        with get_session() as session:
+            ids, matrix, _ = ArticleRepository(session).fetch_embeddings_i8()
+        self._article_ids = ids
+        self._article_matrix = matrix
+        logger.info("novelty_index_loaded", articles=len(ids))
+        return ids, matrix
+
+    def _index(self) -> tuple[np.ndarray, np.ndarray]:
+        """Pre-filter (ids, int8 matrix), loaded on first use."""
+        if self._article_ids is None or self._article_matrix is None:
+            return self.refresh_index()
+        return self._article_ids, self._article_matrix
 
     def assess(self, incoming_text: str) -> NoveltyResult:
-        """Full pipeline: retrieve -> rerank -> assess novelty."""
+        """Full pipeline: pre-filter -> retrieve -> rerank -> assess novelty."""
 
-        # Step 1: Hybrid retrieval
-        candidates = self.retriever.retrieve(incoming_text)
+        # Embed once; the pre-filter and retrieval both reuse it.
+        embedding = self.retriever.embedding_service.embed(incoming_text)
 
-        if not candidates:
-            return NoveltyResult(
-                incoming_text=incoming_text,
-                decision=Decision.PUBLISH,
-                confidence=0.95,
-                reasoning="No existing articles in the database.",
+        # Step 0: Near-identical article -> it is the only candidate
+        duplicate = self._near_duplicates(embedding[None, :])[0]
+        if duplicate is not None:
+            candidates = [duplicate]
+        else:
+            # Step 1: Hybrid retrieval
+            candidates = self.retriever.retrieve(
+                incoming_text, text_embedding=embedding
+            )
+        return self._assess_candidates(incoming_text, candidates)
+
+    def assess_batch(self, incoming_texts: list[str]) -> list[NoveltyResult]:
+        """
+        assess() for many articles, results in input order.
+
+        Embedding and retrieval are batched into single round-trips; per-article
+        LLM work then runs on one event loop, at most settings.llm_concurrency
+        at a time. assess() remains the plain synchronous path.
+        """
+        if not incoming_texts:
+            return []
+
+        embeddings = self.retriever.embedding_service.embed_batch(incoming_texts)
+        duplicates = self._near_duplicates(embeddings)
+
+        pending = [i for i, d in enumerate(duplicates) if d is None]
+        retrieved = iter(
+            self.retriever.retrieve_batch(
+                [incoming_texts[i] for i in pending],
+                embeddings[pending],
             )
+        )
+        # Retrieval results come back in pending order, i.e. the order of the gaps.
+        candidates = [[d] if d is not None else next(retrieved) for d in duplicates]
+        return asyncio.run(
+            self._gather_assessments(list(zip(incoming_texts, candidates)))
+        )
+
+    async def _gather_assessments(
+        self, jobs: list[tuple[str, list[RetrievalResult]]]
+    ) -> list[NoveltyResult]:
+        semaphore = asyncio.Semaphore(settings.llm_concurrency)
 
+        async def run(text: str, candidates: list[RetrievalResult]) -> NoveltyResult:
+            async with semaphore:
+                return await self._assess_async(text, candidates)
+
+        try:
+            return await asyncio.gather(*(run(t, c) for t, c in jobs))
+        finally:
+            # The clients' pools belong to this loop, which ends with asyncio.run.
+            await close_async_openai_clients()
+
+    def _assess_candidates(
+        self, incoming_text: str, candidates: list[RetrievalResult]
+    ) -> NoveltyResult:
+        """Steps 2-3: rerank retrieved candidates, then assess novelty."""
         # Step 2: LLM reranking: filter to truly relevant matches
-        relevant = self.reranker.rerank(incoming_text, candidates)
+        relevant = self.reranker.rerank(incoming_text, candidates) if candidates else []
+        result = self._without_llm(incoming_text, candidates, relevant)
+        if result is not None:
+            return result
+
+        # Step 3: LLM novelty assessment against relevant matches
+        try:
+            response = self.llm.call_structured(
+                self._novelty_prompt(incoming_text, relevant),
+                NoveltyResponse,
+                system=NOVELTY_SYSTEM_PROMPT,
+            )
+        except Exception as e:
+            return self._novelty_failed(incoming_text, relevant, e)
+        return self._novelty_assessed(incoming_text, relevant, response)
 
+    async def _assess_async(
+        self, incoming_text: str, candidates: list[RetrievalResult]
+    ) -> NoveltyResult:
+        """_assess_candidates with the reranker and novelty LLM calls awaited."""
+        relevant = (
+            await self.reranker.rerank_async(incoming_text, candidates)
+            if candidates
+            else []
+        )
+        result = self._without_llm(incoming_text, candidates, relevant)
+        if result is not None:
+            return result
+
+        try:
+            response = await self.async_llm.call_structured(
+                self._novelty_prompt(incoming_text, relevant),
+                NoveltyResponse,
+                system=NOVELTY_SYSTEM_PROMPT,
+            )
+        except Exception as e:
+            return self._novelty_failed(incoming_text, relevant, e)
+        return self._novelty_assessed(incoming_text, relevant, response)
+
+    def _without_llm(
+        self,
+        incoming_text: str,
+        candidates: list[RetrievalResult],
+        relevant: list[RankedResult],
+    ) -> NoveltyResult | None:
+        """Decision without a novelty LLM call: nothing to compare, or cached."""
+        if not candidates:
+            return self._publish(
+                incoming_text, 0.95, "No existing articles in the database."
+            )
         if not relevant:
-            return NoveltyResult(
-                incoming_text=incoming_text,
-                decision=Decision.PUBLISH,
-                confidence=0.90,
-                reasoning="Retrieved articles are not about the same story. New topic.",
+            return self._publish(
+                incoming_text,
+                0.90,
+                "Retrieved articles are not about the same story. New topic.",
             )
 
-        # Step 3: LLM novelty assessment against relevant matches
-        return self._assess_novelty(incoming_text, relevant)
+        cached = self.cache.get(self._novelty_cache_key(incoming_text, relevant))
+        if cached is None:
+            return None
+        logger.debug("novelty_cache_hit")
+        return self._novelty_result(
+            incoming_text, relevant, NoveltyResponse.model_validate(cached)
+        )
 
-    def _assess_novelty(
+    def _novelty_assessed(
         self,
         incoming_text: str,
         relevant_matches: list[RankedResult],
+        response: NoveltyResponse,
     ) -> NoveltyResult:
-        """Ask LLM whether incoming article adds new info vs existing coverage."""
-
-        existing_formatted = "\n\n---\n\n".join(
-            f"[Article {i+1}]:\n{m.text}" for i, m in enumerate(relevant_matches)
+        """Cache a fresh LLM response and turn it into the result."""
+        self.cache.set(
+            self._novelty_cache_key(incoming_text, relevant_matches),
+            response.model_dump(),
         )
+        return self._novelty_result(incoming_text, relevant_matches, response)
 
-        prompt = NOVELTY_ASSESSMENT_PROMPT.format(
-            existing_articles=existing_formatted,
-            incoming_article=incoming_text,
+    @staticmethod
+    def _publish(
+        incoming_text: str, confidence: float, reasoning: str
+    ) -> NoveltyResult:
+        return NoveltyResult(
+            incoming_text=incoming_text,
+            decision=Decision.PUBLISH,
+            confidence=confidence,
+            reasoning=reasoning,
         )
 
-        try:
-            response: NoveltyResponse = self.llm.call_structured(  # type: ignore[assignment]
-                prompt, NoveltyResponse, system=NOVELTY_SYSTEM_PROMPT
+    def _near_duplicates(self, embeddings: np.ndarray) -> list[RetrievalResult | None]:
+        """
+        Per embedding, the closest stored article if above the duplicate threshold.
+
+        A hit replaces retrieval but is still reranked and assessed: a
+        near-identical rewrite can carry a status change ("suspect arrested"
+        vs "suspect charged") that only the LLM notices.
+        """
+        article_ids, article_matrix = self._index()
+        if not len(article_ids):
+            return [None] * len(embeddings)
+
+        hits: list[tuple[int, float] | None] = []
+        for embedding in embeddings:
+            idx, sims = topk(embedding, article_matrix, 1)
+            similarity = float(sims[0])
+            if similarity < self.duplicate_threshold:
+                hits.append(None)
+                continue
+            top_id = int(article_ids[idx[0]])
+            logger.info(
+                "duplicate_prefilter_hit", article_id=top_id, similarity=similarity
             )
+            hits.append((top_id, similarity))
+        if not any(hits):
+            return [None] * len(embeddings)
 
-            # Low confidence -> REVIEW for human editor
-            if response.confidence < self.confidence_threshold:
-                decision = Decision.REVIEW
-                reasoning = (
-                    f"[LOW CONFIDENCE — FLAGGED FOR REVIEW] {response.reasoning}"
+        with get_session() as session:
+            texts = ArticleRepository(session).fetch_texts(
+                list({hit[0] for hit in hits if hit is not None})
+            )
+        # Ranked as the top semantic hit; an article deleted since the index
+        # was loaded falls back to retrieval.
+        rrf_score = 1.0 / (settings.rrf_k + 1)
+        return [
+            (
+                RetrievalResult(
+                    id=hit[0],
+                    text=texts[hit[0]],
+                    rrf_score=rrf_score,
+                    semantic_rank=1,
+                    semantic_score=hit[1],
                 )
-            else:
-                decision = Decision(response.decision)
-                reasoning = response.reasoning
-
-            top = relevant_matches[0]
-            return NoveltyResult(
-                incoming_text=incoming_text,
-                decision=decision,
-                confidence=response.confidence,
-                reasoning=reasoning,
-                new_information=response.new_information,
-                status_change_detected=response.status_change_detected,
-                top_match_text=top.text,
-                top_match_similarity=top.relevance_score,
-                top_match_id=top.id,
-                relevant_matches_count=len(relevant_matches),
+                if hit is not None and hit[0] in texts
+                else None
             )
+            for hit in hits
+        ]
 
-        except Exception as e:
-            logger.error("novelty_assessment_failed", error=str(e))
-            return NoveltyResult(
-                incoming_text=incoming_text,
-                decision=Decision.REVIEW,
-                confidence=0.0,
-                reasoning=f"Assessment failed: {e}. Flagged for manual review.",
-                top_match_text=relevant_matches[0].text if relevant_matches else None,
-                top_match_id=relevant_matches[0].id if relevant_matches else None,
-                relevant_matches_count=len(relevant_matches),
-            )
+    @staticmethod
+    def _novelty_prompt(
+        incoming_text: str, relevant_matches: list[RankedResult]
+    ) -> str:
+        existing_formatted = "\n\n---\n\n".join(
+            f"[Article {i+1}]:\n{m.text}" for i, m in enumerate(relevant_matches)
+        )
+        return render_novelty_prompt(existing_formatted, incoming_text)
+
+    @staticmethod
+    def _novelty_cache_key(
+        incoming_text: str, relevant_matches: list[RankedResult]
+    ) -> str:
+        """
+        Cache key: (model, prompt version, incoming text, relevant article texts).
+
+        The texts are what the LLM saw; ids change on re-ingestion. Their hashes
+        are sorted so reranker order does not split entries.
+        """
+        return content_key(
+            settings.llm_model,
+            _PROMPT_VERSION,
+            incoming_text,
+            *sorted(content_key(m.text) for m in relevant_matches),
+        )
+
+    def _novelty_result(
+        self,
+        incoming_text: str,
+        relevant_matches: list[RankedResult],
+        response: NoveltyResponse,
+    ) -> NoveltyResult:
+        # Low confidence -> REVIEW for human editor
+        if response.confidence < self.confidence_threshold:
+            decision = Decision.REVIEW
+            reasoning = f"[LOW CONFIDENCE — FLAGGED FOR REVIEW] {response.reasoning}"
+        else:
+            decision = Decision(response.decision)
+            reasoning = response.reasoning
+
+        top = relevant_matches[0]
+        return NoveltyResult(
+            incoming_text=incoming_text,
+            decision=decision,
+            confidence=response.confidence,
+            reasoning=reasoning,
+            new_information=response.new_information,
+            status_change_detected=response.status_change_detected,
+            top_match_text=top.text,
+            top_match_similarity=top.relevance_score,
+            top_match_id=top.id,
+            relevant_matches_count=len(relevant_matches),
+        )
+
+    @staticmethod
+    def _novelty_failed(
+        incoming_text: str, relevant_matches: list[RankedResult], error: Exception
+    ) -> NoveltyResult:
+        logger.error("novelty_assessment_failed", error=str(error))
+        return NoveltyResult(
+            incoming_text=incoming_text,
+            decision=Decision.REVIEW,
+            confidence=0.0,
+            reasoning=f"Assessment failed: {error}. Flagged for manual review.",
+            top_match_text=relevant_matches[0].text if relevant_matches else None,
+            top_match_id=relevant_matches[0].id if relevant_matches else None,
+            relevant_matches_count=len(relevant_matches),
+        )
@@ -1,5 +1,7 @@
 """Novelty assessment prompts."""
 
+from src.services.prompts import split_template
+
 NOVELTY_SYSTEM_PROMPT = (
     "You are an expert football news editor. Decide whether an incoming article "
     "should be PUBLISHED or SKIPPED based on whether it adds meaningful new "
@@ -35,3 +37,21 @@ Respond in JSON:
     "new_information": ["specific new facts if PUBLISH, empty list if SKIP"],
     "status_change_detected": true/false
 }}"""
+
+
+_NOVELTY_PREFIX, _NOVELTY_MIDDLE, _NOVELTY_SUFFIX = split_template(
+    NOVELTY_ASSESSMENT_PROMPT, "existing_articles", "incoming_article"
+)
+
+
+def render_novelty_prompt(existing_articles: str, incoming_article: str) -> str:
+    """Same output as NOVELTY_ASSESSMENT_PROMPT.format(...)."""
+    return "".join(
+        (
+            _NOVELTY_PREFIX,
+            existing_articles,
+            _NOVELTY_MIDDLE,
+            incoming_article,
+            _NOVELTY_SUFFIX,
+        )
+    )
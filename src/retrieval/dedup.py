@@ -0,0 +1,50 @@
+"""
+Near-duplicate detection via MinHash LSH (datasketch).
+
+Hybrid retrieval often returns the same story more than once (re-scraped copies,
+boilerplate wrappers). Grouping them lets the reranker score one copy per group.
+"""
+
+from datasketch import MinHash, MinHashLSH
+
+from src.retrieval.models import RetrievalResult
+
+_SHINGLE_WORDS = 5
+_NUM_PERM = 64
+
+
+def _shingles(text: str) -> list[bytes]:
+    """Lower-cased word 5-grams; texts shorter than that are one shingle."""
+    words = text.lower().split()
+    if len(words) <= _SHINGLE_WORDS:
+        return [" ".join(words).encode()]
+    return [
+        " ".join(words[i : i + _SHINGLE_WORDS]).encode()
+        for i in range(len(words) - _SHINGLE_WORDS + 1)
+    ]
+
+
+def find_near_duplicates(
+    candidates: list[RetrievalResult], threshold: float
+) -> dict[int, int]:
+    """
+    Map each near-duplicate candidate id to the id of its representative.
+
+    Candidates are visited in order, so with RRF-ordered input the representative
+    is the best-ranked copy. Representatives themselves are not in the mapping.
+    """
+    lsh = MinHashLSH(threshold=threshold, num_perm=_NUM_PERM)
+    position = {c.id: i for i, c in enumerate(candidates)}
+    duplicate_of: dict[int, int] = {}
+
+    for candidate in candidates:
+        minhash = MinHash(num_perm=_NUM_PERM)
+        minhash.update_batch(_shingles(candidate.text))
+
+        matches = lsh.query(minhash)
+        if matches:
+            duplicate_of[candidate.id] = min(matches, key=position.__getitem__)
+        else:
+            lsh.insert(candidate.id, minhash)
+
+    return duplicate_of
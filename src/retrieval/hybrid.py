@@ -8,86 +8,213 @@ RRF combines both without needing the score normalization.
 RRF: score(d) = Σ 1 / (k + rank_i(d))
 """
 
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, NamedTuple, TypeVar
+
+import numpy as np
 
 from src.config.settings import settings
 from src.db.connection import get_session
 from src.db.repository import ArticleRepository
-from src.db.models import ArticleRecord
+from src.db.models import ArticleHit
 from src.retrieval.models import RetrievalResult
 from src.services.embedding import BaseEmbeddingService, create_embedding_service
 from src.logger import get_logger
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+
+class _Fused(NamedTuple):
+    """A fused hit before its text is fetched; fields follow RetrievalResult."""
+
+    id: int
+    rrf_score: float
+    semantic_rank: int | None
+    keyword_rank: int | None
+    semantic_score: float | None
+    keyword_score: float | None
+
 
 class HybridRetriever:
     def __init__(self, embedding_service: BaseEmbeddingService | None = None):
         self.embedding_service = embedding_service or create_embedding_service()
         self.rrf_k = settings.rrf_k
+        # 1 / (rrf_k + rank) for ranks 1..max_top_k, sliced per fusion.
+        self._rrf_weights = self._reciprocal_ranks(settings.max_top_k)
 
     def retrieve(
-        self, query_text: str, top_k: int | None = None
+        self,
+        query_text: str,
+        top_k: int | None = None,
+        pool_size: int | None = None,
+        text_embedding: np.ndarray | None = None,
     ) -> list[RetrievalResult]:
         """
         Hybrid search: semantic + keyword + RRF fusion.
 
-        then returns the top_k fused results.
+        Each search fetches pool_size candidates (defaults to top_k),
+        then returns the top_k fused results. Pass text_embedding if the
+        caller already embedded query_text.
         """
         top_k = top_k or settings.top_k
-
-        query_embedding = self.embedding_service.embed(query_text)
-
-        with get_session() as session:
-            repo = ArticleRepository(session)
-            semantic = repo.search_semantic(query_embedding, limit=top_k)
-            keyword = repo.search_keyword(query_text, limit=top_k)
+        limit = max(pool_size or top_k, top_k)
+
+        # Sessions aren't thread-safe, so each search opens its own. The keyword
+        # search starts first and overlaps with embedding the query here;
+        # wall time is max(embed + semantic, keyword).
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            keyword_future = executor.submit(
+                self._search, ArticleRepository.search_keyword, query_text, limit
+            )
+            if text_embedding is None:
+                text_embedding = self.embedding_service.embed(query_text)
+            semantic_future = executor.submit(
+                self._search, ArticleRepository.search_semantic, text_embedding, limit
+            )
+            semantic, keyword = semantic_future.result(), keyword_future.result()
 
         fused = self._fuse_rrf(semantic, keyword, top_k)
+        results = self._with_texts(
+            fused, self._search(ArticleRepository.fetch_texts, [f.id for f in fused])
+        )
 
         logger.info(
             "hybrid_retrieval",
             semantic_hits=len(semantic),
             keyword_hits=len(keyword),
-            fused=len(fused),
+            fused=len(results),
         )
-        return fused
+        return results
+
+    def retrieve_batch(
+        self,
+        query_texts: list[str],
+        query_embeddings: np.ndarray | None = None,
+        top_k: int | None = None,
+        pool_size: int | None = None,
+    ) -> list[list[RetrievalResult]]:
+        """
+        retrieve() for many queries: one embedding call and one SQL round-trip
+        per search type, instead of one of each per query.
+        """
+        if not query_texts:
+            return []
+        top_k = top_k or settings.top_k
+        limit = max(pool_size or top_k, top_k)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            keyword_future = executor.submit(
+                self._search, ArticleRepository.search_keyword_batch, query_texts, limit
+            )
+            if query_embeddings is None:
+                query_embeddings = self.embedding_service.embed_batch(query_texts)
+            semantic_future = executor.submit(
+                self._search,
+                ArticleRepository.search_semantic_batch,
+                query_embeddings,
+                limit,
+            )
+            semantic, keyword = semantic_future.result(), keyword_future.result()
+
+        fused = [self._fuse_rrf(s, k, top_k) for s, k in zip(semantic, keyword)]
+        # One text fetch for the winners of every query (ids may repeat across them).
+        texts = self._search(
+            ArticleRepository.fetch_texts, list({f.id for hits in fused for f in hits})
+        )
+        results = [self._with_texts(hits, texts) for hits in fused]
+
+        logger.info(
+            "hybrid_retrieval_batch",
+            queries=len(query_texts),
+            semantic_hits=sum(len(s) for s in semantic),
+            keyword_hits=sum(len(k) for k in keyword),
+        )
+        return results
+
+    @staticmethod
+    def _search(search: Callable[..., T], *args: Any) -> T:
+        """Run one ArticleRepository search on a session of its own."""
+        with get_session() as session:
+            return search(ArticleRepository(session), *args)
+
+    def _reciprocal_ranks(self, n: int) -> np.ndarray:
+        return 1.0 / (self.rrf_k + np.arange(1, n + 1, dtype=np.float32))
 
     def _fuse_rrf(
         self,
-        semantic: list[ArticleRecord],
-        keyword: list[ArticleRecord],
+        semantic: list[ArticleHit],
+        keyword: list[ArticleHit],
         top_k: int,
-    ) -> list[RetrievalResult]:
-        """Combine two ranked lists via RRF (Reciprocal Rank Fusion)."""
-        scores: dict[int, float] = defaultdict(float)
-        meta: dict[int, dict] = {}
-
-        for rank, a in enumerate(semantic, start=1):
-            scores[a.id] += 1.0 / (self.rrf_k + rank)
-            meta.setdefault(a.id, {"text": a.text})
-            meta[a.id]["semantic_rank"] = rank
-            meta[a.id]["semantic_score"] = a.score
-
-        for rank, a in enumerate(keyword, start=1):
-            scores[a.id] += 1.0 / (self.rrf_k + rank)
-            meta.setdefault(a.id, {"text": a.text})
-            meta[a.id]["keyword_rank"] = rank
-            meta[a.id]["keyword_score"] = a.score
-
-        sorted_ids = sorted(scores.keys(), key=lambda id: scores[id], reverse=True)[
-            :top_k
-        ]
+    ) -> list[_Fused]:
+        """
+        Combine two ranked lists via RRF (Reciprocal Rank Fusion).
 
-        return [
-            RetrievalResult(
-                id=did,
-                text=meta[did]["text"],
-                rrf_score=scores[did],
-                semantic_rank=meta[did].get("semantic_rank"),
-                keyword_rank=meta[did].get("keyword_rank"),
-                semantic_score=meta[did].get("semantic_score"),
-                keyword_score=meta[did].get("keyword_score"),
+        Fusion only needs ids and scores; texts are attached to the top_k
+        winners afterwards by _with_texts.
+        """
+        sem_ids = np.fromiter(
+            (a.id for a in semantic), dtype=np.int64, count=len(semantic)
+        )
+        kw_ids = np.fromiter(
+            (a.id for a in keyword), dtype=np.int64, count=len(keyword)
+        )
+        if sem_ids.size + kw_ids.size == 0:
+            return []
+
+        # Unique ids plus, for every hit, the slot its contribution lands in;
+        # np.add.at accumulates repeated slots (ids found by both searches).
+        # first_seen is each id's first position (semantic hits before keyword).
+        all_ids, first_seen, slots = np.unique(
+            np.concatenate([sem_ids, kw_ids]), return_index=True, return_inverse=True
+        )
+        if max(sem_ids.size, kw_ids.size) > self._rrf_weights.size:
+            self._rrf_weights = self._reciprocal_ranks(max(sem_ids.size, kw_ids.size))
+        contributions = np.concatenate(
+            [self._rrf_weights[: sem_ids.size], self._rrf_weights[: kw_ids.size]]
+        )
+        scores = np.zeros(all_ids.size, dtype=np.float32)
+        np.add.at(scores, slots, contributions)
+
+        # Equal scores are routine (semantic rank r == keyword rank r), so ties
+        # go to the first-seen hit rather than to np.unique's id order.
+        top = np.lexsort((first_seen, -scores))[:top_k]
+
+        # 1-based rank of each unique id in either list (0 = absent), scattered
+        # from the same slots: winners index straight back into the input lists.
+        sem_rank = np.zeros(all_ids.size, dtype=np.int64)
+        sem_rank[slots[: sem_ids.size]] = np.arange(1, sem_ids.size + 1)
+        kw_rank = np.zeros(all_ids.size, dtype=np.int64)
+        kw_rank[slots[sem_ids.size :]] = np.arange(1, kw_ids.size + 1)
+
+        fused = []
+        for i in top:
+            s_rank, k_rank = int(sem_rank[i]), int(kw_rank[i])
+            fused.append(
+                _Fused(
+                    id=int(all_ids[i]),
+                    rrf_score=float(scores[i]),
+                    semantic_rank=s_rank or None,
+                    keyword_rank=k_rank or None,
+                    semantic_score=semantic[s_rank - 1].score if s_rank else None,
+                    keyword_score=keyword[k_rank - 1].score if k_rank else None,
+                )
             )
-            for did in sorted_ids
+        return fused
+
+    @staticmethod
+    def _with_texts(
+        fused: list[_Fused], texts: dict[int, str]
+    ) -> list[RetrievalResult]:
+        """Attach article texts; an article deleted since the search is dropped."""
+        return [
+            RetrievalResult(f.id, texts[f.id], *f[1:]) for f in fused if f.id in texts
         ]
+
+
+@lru_cache(maxsize=1)
+def get_default_retriever() -> HybridRetriever:
+    """Process-wide retriever with the configured embedding service."""
+    return HybridRetriever()
@@ -1,9 +1,17 @@
-"""Retrieval domain models."""
+"""
+Retrieval domain models.
+
+Results built per query from trusted data are slotted frozen dataclasses (no
+validation pass); models parsed from LLM output stay pydantic.
+"""
+
+from dataclasses import dataclass
 
 from pydantic import BaseModel, Field
 
 
-class RetrievalResult(BaseModel):
+@dataclass(slots=True, frozen=True)
+class RetrievalResult:
     """Fused result after RRF of semantic + keyword search."""
 
     id: int
@@ -14,25 +22,29 @@ class RetrievalResult(BaseModel):
     semantic_score: float | None = None
     keyword_score: float | None = None
 
-    model_config = {"frozen": True}
 
+class RerankerItem(BaseModel):
+    """LLM reranker judgement for one candidate (id = its 1-based position in the prompt)."""
 
-class RerankerResponse(BaseModel):
-    """LLM reranker output."""
-
+    id: int
     relevance: float = Field(ge=0.0, le=1.0)
     reason: str = ""
 
 
-class RankedResult(BaseModel):
-    """Final result after LLM reranking."""
+class RerankerBatchResponse(BaseModel):
+    """LLM reranker output: one item per candidate in the prompt."""
+
+    scores: list[RerankerItem] = Field(default_factory=list)
+
+
+@dataclass(slots=True, frozen=True)
+class RankedResult:
+    """Final result after LLM reranking. relevance_score is in [0, 1]."""
 
     id: int
     text: str
     rrf_score: float
-    relevance_score: float = Field(ge=0.0, le=1.0)
+    relevance_score: float
     relevance_reason: str = ""
     semantic_rank: int | None = None
     keyword_rank: int | None = None
-
-    model_config = {"frozen": True}
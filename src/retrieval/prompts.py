@@ -1,8 +1,10 @@
 """Reranker prompt."""
 
-RERANKER_PROMPT = """You are a relevance assessor for a football article/news retrieval system.
+from src.services.prompts import split_template
 
-Rate how relevant the CANDIDATE article is to the QUERY article on a scale of 0.0 to 1.0:
+RERANKER_BATCH_PROMPT = """You are a relevance assessor for a football article/news retrieval system.
+
+Rate how relevant EACH candidate article is to the QUERY article on a scale of 0.0 to 1.0:
 
 - 1.0: Same story, same entities, directly comparable
 - 0.7-0.9: Same topic/player, closely related context
@@ -10,11 +12,30 @@ Rate how relevant the CANDIDATE article is to the QUERY article on a scale of 0.
 - 0.1-0.3: Loosely related (same league, same position)
 - 0.0: Completely unrelated
 
+Judge every candidate independently against the query.
+
 QUERY:
 {query}
 
-CANDIDATE:
-{candidate}
+CANDIDATES:
+{candidates}
+
+Respond in JSON with one entry per candidate, using the candidate's number in brackets as its id.
+Give only the score, no explanations:
+{{"scores": [{{"id": <number>, "relevance": 0.0-1.0}}, ...]}}"""
+
+
+# The query part is built once per rerank() and reused for every window.
+_RERANKER_PREFIX, _RERANKER_MIDDLE, _RERANKER_SUFFIX = split_template(
+    RERANKER_BATCH_PROMPT, "query", "candidates"
+)
+
+
+def render_reranker_head(query: str) -> str:
+    """Everything up to the candidates; reused for every window of one query."""
+    return _RERANKER_PREFIX + query + _RERANKER_MIDDLE
+
 
-Respond in JSON:
-{{"relevance": 0.0-1.0, "reason": "brief explanation"}}"""
+def render_reranker_prompt(head: str, candidates: str) -> str:
+    """Same output as RERANKER_BATCH_PROMPT.format(...), given the query's head."""
+    return head + candidates + _RERANKER_SUFFIX
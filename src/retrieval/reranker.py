@@ -3,21 +3,63 @@ LLM-based reranker.
 
 Filters hybrid search candidates by asking the LLM whether each
 candidate is genuinely about the same story as the query.
+Candidates are scored listwise over a sliding window: reranker_batch_size
+candidates per LLM call, advancing by reranker_window_stride, with up to
+reranker_max_workers windows in flight (rerank_async: all of them, on one
+event loop). Overlapping scores merge by max.
+Near-duplicate candidates (MinHash) are scored once per group, and
+per-(query, candidate) scores are cached, so only unseen pairs reach the LLM.
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import attrgetter
+
 from src.config.settings import settings
-from src.retrieval.models import RetrievalResult, RankedResult, RerankerResponse
-from src.retrieval.prompts import RERANKER_PROMPT
-from src.services.llm import LLMClient
+from src.retrieval.dedup import find_near_duplicates
+from src.retrieval.models import (
+    RetrievalResult,
+    RankedResult,
+    RerankerBatchResponse,
+    RerankerItem,
+)
+from src.retrieval.prompts import (
+    RERANKER_BATCH_PROMPT,
+    render_reranker_head,
+    render_reranker_prompt,
+)
+from src.services.cache import SemanticCache, content_key
+from src.services.llm import AsyncLLMClient, LLMClient
 from src.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Cached scores are only valid for the prompt that produced them.
+_PROMPT_VERSION = content_key(RERANKER_BATCH_PROMPT)[:8]
+
+# Replies are scores only ({"id": 12, "relevance": 0.85} is ~14 tokens), so output
+# is capped at a small per-candidate budget rather than left open-ended. Thinking
+# models (the default Gemini 2.5 Flash) count reasoning against that cap, so
+# reranker calls run with reasoning off.
+_REPLY_TOKENS_PER_CANDIDATE = 20
+
 
 class LLMReranker:
-    def __init__(self, llm_client: LLMClient | None = None):
+    def __init__(
+        self,
+        llm_client: LLMClient | None = None,
+        cache: SemanticCache | None = None,
+        async_llm_client: AsyncLLMClient | None = None,
+    ):
         self.llm = llm_client or LLMClient()
+        self.async_llm = async_llm_client or AsyncLLMClient()
+        self.cache = cache or SemanticCache("reranker", memory_size=10_000)
         self.threshold = settings.reranker_relevance_threshold
+        self.batch_size = settings.reranker_batch_size
+        self.stride = settings.reranker_window_stride
+        self.max_workers = settings.reranker_max_workers
+        self.dedup_threshold = settings.reranker_dedup_threshold
 
     def rerank(
         self,
@@ -25,52 +67,233 @@ class LLMReranker:
         candidates: list[RetrievalResult],
     ) -> list[RankedResult]:
         """Score relevance of each candidate. Returns those above threshold."""
-        ranked: list[RankedResult] = []
+        keys, best, windows, duplicate_of = self._plan(query_text, candidates)
+        head = render_reranker_head(query_text)
+
+        # _score_window never raises (a failed call just scores nothing), so one
+        # flaky call can't abort the others.
+        if self.max_workers > 1 and len(windows) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(windows))
+            ) as executor:
+                scored = list(
+                    executor.map(
+                        lambda window: self._score_window(head, window), windows
+                    )
+                )
+        else:
+            scored = [self._score_window(head, w) for w in windows]
+
+        return self._finish(candidates, keys, best, scored, duplicate_of)
+
+    async def rerank_async(
+        self,
+        query_text: str,
+        candidates: list[RetrievalResult],
+    ) -> list[RankedResult]:
+        """rerank() on AsyncLLMClient: every window in flight on one event loop."""
+        keys, best, windows, duplicate_of = self._plan(query_text, candidates)
+        head = render_reranker_head(query_text)
+        scored = await asyncio.gather(
+            *(self._score_window_async(head, w) for w in windows)
+        )
+        return self._finish(candidates, keys, best, scored, duplicate_of)
+
+    def _plan(self, query_text: str, candidates: list[RetrievalResult]) -> tuple[
+        dict[int, str],
+        dict[int, RerankerItem],
+        list[list[RetrievalResult]],
+        dict[int, int],
+    ]:
+        """
+        Cache keys, cached scores, the windows left to score, and near-duplicates.
+
+        Only one copy per near-duplicate group (the best RRF rank) is scored;
+        duplicate_of maps the other copies to it.
+        """
+        duplicate_of = (
+            find_near_duplicates(candidates, self.dedup_threshold)
+            if self.dedup_threshold
+            else {}
+        )
+        if duplicate_of:
+            logger.debug("reranker_duplicates", skipped=len(duplicate_of))
+            candidates = [c for c in candidates if c.id not in duplicate_of]
+
+        keys = {c.id: self._cache_key(query_text, c) for c in candidates}
+        cached = self.cache.get_many(list(keys.values()))
+        best: dict[int, RerankerItem] = {
+            candidate_id: RerankerItem.model_validate(item)
+            for candidate_id, item in zip(keys, cached)
+            if item is not None
+        }
+        if best:
+            logger.debug("reranker_cache_hit", hits=len(best), total=len(candidates))
+
+        uncached = [c for c in candidates if c.id not in best]
+        windows = [
+            uncached[start : start + self.batch_size]
+            for start in self._window_starts(len(uncached))
+        ]
+        return keys, best, windows, duplicate_of
+
+    def _finish(
+        self,
+        candidates: list[RetrievalResult],
+        keys: dict[int, str],
+        best: dict[int, RerankerItem],
+        scored: list[dict[int, RerankerItem]],
+        duplicate_of: dict[int, int],
+    ) -> list[RankedResult]:
+        """
+        Merge window scores, cache them, apply the threshold and rank.
 
+        Near-duplicates take their representative's score (or fallback).
+        """
+        # Candidates seen by two windows keep their higher score.
+        fresh: dict[int, RerankerItem] = {}
+        for window_scores in scored:
+            for candidate_id, item in window_scores.items():
+                current = fresh.get(candidate_id)
+                if current is None or item.relevance > current.relevance:
+                    fresh[candidate_id] = item
+        if fresh:
+            self.cache.set_many(
+                {keys[cid]: item.model_dump() for cid, item in fresh.items()}
+            )
+        best = {**best, **fresh}
+
+        ranked: list[RankedResult] = []
         for candidate in candidates:
-            prompt = RERANKER_PROMPT.format(
-                query=query_text,
-                candidate=candidate.text,
+            score = best.get(duplicate_of.get(candidate.id, candidate.id))
+            if score is None:
+                logger.warning("reranker_fallback", candidate_id=candidate.id)
+                ranked.append(self._fallback(candidate))
+            elif score.relevance >= self.threshold:
+                ranked.append(self._ranked(candidate, score))
+
+        ranked.sort(key=attrgetter("relevance_score"), reverse=True)
+        logger.info(
+            "reranking_done",
+            input=len(candidates),
+            output=len(ranked),
+            calls=len(scored),
+        )
+        return ranked
+
+    def _window_starts(self, n: int) -> list[int]:
+        """Start offsets of the sliding windows; the last window always reaches n."""
+        if n <= self.batch_size:
+            return [0] if n else []
+        stride = max(1, min(self.stride, self.batch_size))
+        starts = list(range(0, n - self.batch_size + 1, stride))
+        if starts[-1] + self.batch_size < n:
+            starts.append(n - self.batch_size)
+        return starts
+
+    def _score_window(
+        self, head: str, window: list[RetrievalResult]
+    ) -> dict[int, RerankerItem]:
+        """
+        One listwise LLM call for the window, scores keyed by candidate id.
+
+        Candidates are numbered [1]..[n] in the prompt; the reply's ids are those
+        positions and are mapped back here. Unscored candidates are simply absent.
+        """
+        prompt, max_tokens = self._window_request(head, window)
+        try:
+            response = self.llm.call_structured(
+                prompt, RerankerBatchResponse, max_tokens=max_tokens, reasoning=False
             )
+        except Exception as e:
+            return self._window_failed(window, e)
+        return self._window_scores(window, response)
 
-            try:
-                response = self.llm.call_structured(prompt, RerankerResponse)
-
-                if response.relevance >= self.threshold:
-                    ranked.append(
-                        RankedResult(
-                            id=candidate.id,
-                            text=candidate.text,
-                            rrf_score=candidate.rrf_score,
-                            relevance_score=response.relevance,
-                            relevance_reason=response.reason,
-                            semantic_rank=candidate.semantic_rank,
-                            keyword_rank=candidate.keyword_rank,
-                        )
-                    )
+    async def _score_window_async(
+        self, head: str, window: list[RetrievalResult]
+    ) -> dict[int, RerankerItem]:
+        """Async _score_window."""
+        prompt, max_tokens = self._window_request(head, window)
+        try:
+            response = await self.async_llm.call_structured(
+                prompt, RerankerBatchResponse, max_tokens=max_tokens, reasoning=False
+            )
+        except Exception as e:
+            return self._window_failed(window, e)
+        return self._window_scores(window, response)
 
-                logger.debug(
-                    "rerank_result",
-                    candidate_id=candidate.id,
-                    relevance=response.relevance,
-                )
+    @staticmethod
+    def _window_request(head: str, window: list[RetrievalResult]) -> tuple[str, int]:
+        """The window's prompt and its output-token cap."""
+        prompt = render_reranker_prompt(
+            head,
+            "\n\n---\n\n".join(f"[{i}]\n{c.text}" for i, c in enumerate(window, 1)),
+        )
+        return prompt, _REPLY_TOKENS_PER_CANDIDATE * len(window) + 16
 
-            except Exception as e:
-                logger.warning(
-                    "reranker_fallback", candidate_id=candidate.id, error=str(e)
-                )
-                ranked.append(
-                    RankedResult(
-                        id=candidate.id,
-                        text=candidate.text,
-                        rrf_score=candidate.rrf_score,
-                        relevance_score=candidate.rrf_score,
-                        relevance_reason="reranker_fallback",
-                        semantic_rank=candidate.semantic_rank,
-                        keyword_rank=candidate.keyword_rank,
-                    )
-                )
+    @staticmethod
+    def _window_failed(
+        window: list[RetrievalResult], error: Exception
+    ) -> dict[int, RerankerItem]:
+        """A failed call scores nothing; its candidates fall back in _finish."""
+        logger.warning("reranker_fallback", window_size=len(window), error=str(error))
+        return {}
 
-        ranked.sort(key=lambda r: r.relevance_score, reverse=True)
-        logger.info("reranking_done", input=len(candidates), output=len(ranked))
-        return ranked
+    @staticmethod
+    def _window_scores(
+        window: list[RetrievalResult], response: RerankerBatchResponse
+    ) -> dict[int, RerankerItem]:
+        """Map the reply's positional ids back to candidate ids."""
+        scores: dict[int, RerankerItem] = {}
+        for item in response.scores:
+            if not 1 <= item.id <= len(window):
+                continue
+            candidate = window[item.id - 1]
+            logger.debug(
+                "rerank_result", candidate_id=candidate.id, relevance=item.relevance
+            )
+            scores[candidate.id] = item.model_copy(update={"id": candidate.id})
+        return scores
+
+    @staticmethod
+    def _cache_key(query_text: str, candidate: RetrievalResult) -> str:
+        """
+        Cache key: (model, prompt version, query text, candidate text).
+
+        Keyed on the text, not the id: ids are reassigned when the table is
+        re-ingested, which would otherwise serve scores for other articles.
+        """
+        return content_key(
+            settings.llm_model, _PROMPT_VERSION, query_text, candidate.text
+        )
+
+    @staticmethod
+    def _ranked(candidate: RetrievalResult, item: RerankerItem) -> RankedResult:
+        return RankedResult(
+            id=candidate.id,
+            text=candidate.text,
+            rrf_score=candidate.rrf_score,
+            relevance_score=item.relevance,
+            relevance_reason=item.reason,
+            semantic_rank=candidate.semantic_rank,
+            keyword_rank=candidate.keyword_rank,
+        )
+
+    @staticmethod
+    def _fallback(candidate: RetrievalResult) -> RankedResult:
+        """Unscored candidate: keep it, with its RRF score as a neutral relevance."""
+        return RankedResult(
+            id=candidate.id,
+            text=candidate.text,
+            rrf_score=candidate.rrf_score,
+            relevance_score=candidate.rrf_score,
+            relevance_reason="reranker_fallback",
+            semantic_rank=candidate.semantic_rank,
+            keyword_rank=candidate.keyword_rank,
+        )
+
+
+@lru_cache(maxsize=1)
+def get_default_reranker() -> LLMReranker:
+    """Process-wide reranker with the default LLM client."""
+    return LLMReranker()
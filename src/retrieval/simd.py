@@ -0,0 +1,34 @@
+"""
+SIMD vector similarity via SimSIMD (AVX2 / AVX-512 VNNI / NEON kernels).
+
+Matrices are kept int8-quantized with a per-row scale (see
+src/services/quantize.py), which runs on the int8 dot-product kernels.
+"""
+
+import numpy as np
+import simsimd
+
+from src.services.quantize import quantize_i8
+
+
+def topk(q: np.ndarray, matrix: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k rows of matrix by cosine similarity to q.
+
+    A float query against an int8 matrix is quantized first.
+
+    :return: (row indices, similarities), best first
+    """
+    q = np.asarray(q)
+    if matrix.dtype == np.int8 and q.dtype != np.int8:
+        q = quantize_i8(q)[0][0]
+    else:
+        q = q.astype(matrix.dtype, copy=False)
+
+    distances = np.asarray(simsimd.cdist(q[None, :], matrix, metric="cosine"))
+    sims = 1.0 - distances.ravel()
+
+    k = min(k, sims.size)
+    idx = np.argpartition(-sims, k - 1)[:k]
+    idx = idx[np.argsort(-sims[idx])]
+    return idx, sims[idx]
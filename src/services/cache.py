@@ -0,0 +1,104 @@
+"""
+Content-addressed cache for embeddings and LLM responses (diskcache).
+
+Keys are blake2b digests of the content (plus whatever identifies the producer,
+e.g. the model name), so unchanged inputs hit across runs and processes.
+An optional in-memory LRU in front of the disk layer serves hot keys without I/O.
+"""
+
+import hashlib
+import threading
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+import diskcache
+from cachetools import Cache, LRUCache, TTLCache
+
+from src.config.settings import settings
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def content_key(*parts: str) -> str:
+    """Stable 128-bit hex key over the given strings."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode())
+        h.update(b"\x00")  # separator: ("ab", "c") != ("a", "bc")
+    return h.hexdigest()
+
+
+class _Default(Enum):
+    """Sentinel for "use settings", so that ttl=None can mean "never expire"."""
+
+    TTL = 0
+
+
+class SemanticCache:
+    """
+    Namespaced on-disk cache. Entries expire after ttl seconds (None = never,
+    default = settings.cache_ttl_seconds).
+
+    memory_size > 0 adds an in-process LRU of that many entries in front of the
+    disk layer (same ttl). Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        directory: str | Path | None = None,
+        ttl: int | None | _Default = _Default.TTL,
+        memory_size: int = 0,
+    ):
+        self.namespace = namespace
+        self.ttl = settings.cache_ttl_seconds if ttl is _Default.TTL else ttl
+        self._cache = diskcache.Cache(
+            str(Path(directory or settings.cache_dir) / namespace)
+        )
+        self._memory: Cache | None = None
+        if memory_size:
+            self._memory = (
+                TTLCache(maxsize=memory_size, ttl=self.ttl)
+                if self.ttl
+                else LRUCache(maxsize=memory_size)
+            )
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        if self._memory is not None:
+            with self._lock:
+                value = self._memory.get(key)
+            if value is not None:
+                return value
+
+        value = self._cache.get(key)
+        if value is not None:
+            self._remember(key, value)
+        return value
+
+    def get_many(self, keys: list[str]) -> list[Any | None]:
+        return [self.get(k) for k in keys]
+
+    def set(self, key: str, value: Any) -> None:
+        self._cache.set(key, value, expire=self.ttl)
+        self._remember(key, value)
+
+    def set_many(self, items: dict[str, Any]) -> None:
+        with self._cache.transact():
+            for key, value in items.items():
+                self._cache.set(key, value, expire=self.ttl)
+        for key, value in items.items():
+            self._remember(key, value)
+
+    def expire(self) -> int:
+        """Evict expired entries. Returns the number removed."""
+        removed = self._cache.expire()
+        logger.info("cache_expired", namespace=self.namespace, removed=removed)
+        return removed
+
+    def _remember(self, key: str, value: Any) -> None:
+        if self._memory is not None:
+            with self._lock:
+                self._memory[key] = value
@@ -1,70 +1,208 @@
 """
-Embedding service with two providers:
+Embedding service with three providers:
 
 - "local": sentence-transformers (no API calls, runs on CPU/GPU)
+- "model2vec": static (lookup-table) embeddings, a fast CPU-only alternative to "local"
 - "openrouter": OpenRouter API (same key as LLM, no local model needed)
 
 Configured via EMBEDDING_PROVIDER in settings (.env overrides).
-Both implement the same interface.
+Both implement the same interface; the base class caches vectors by
+(model_id, text), so providers only ever see cache misses.
 """
 
 import abc
+import asyncio
+from functools import lru_cache
 
-from openai import OpenAI
+import numpy as np
+import torch
+from model2vec import StaticModel
 from sentence_transformers import SentenceTransformer
 
 from src.config.settings import settings
 from src.logger import get_logger
+from src.services.cache import SemanticCache, content_key
+from src.services.llm import get_async_openai_client, get_openai_client
 
 logger = get_logger(__name__)
 
 
+def _as_float32(vector: np.ndarray | list[float]) -> np.ndarray:
+    """Provider output as a float32 array (no copy if it already is one)."""
+    return np.asarray(vector, dtype=np.float32)
+
+
 class BaseEmbeddingService(abc.ABC):
-    """Interface that any provider implements."""
+    """
+    Interface that any provider implements.
+
+    embed/embed_batch are cached here (in-memory LRU + on-disk "embeddings"
+    namespace); providers implement the uncached _embed/_embed_batch.
+    """
+
+    def __init__(self, cache: SemanticCache | None = None):
+        self.cache = cache or SemanticCache(
+            "embeddings", memory_size=settings.embedding_cache_size
+        )
 
+    @property
     @abc.abstractmethod
-    def embed(self, text: str) -> list[float]: ...
+    def model_id(self) -> str:
+        """Identifies the model producing the vectors (used in cache keys)."""
 
     @abc.abstractmethod
-    def embed_batch(self, texts: list[str]) -> list[list[float]]: ...
+    def _embed(self, text: str) -> np.ndarray | list[float]: ...
+
+    @abc.abstractmethod
+    def _embed_batch(self, texts: list[str]) -> np.ndarray | list[list[float]]: ...
+
+    def embed(self, text: str) -> np.ndarray:
+        """float32 vector, shape (dim,). Shared via the cache: don't mutate it."""
+        key = content_key(self.model_id, text)
+        vector = self.cache.get(key)
+        if vector is None:
+            vector = _as_float32(self._embed(text))
+            self.cache.set(key, vector)
+        return vector
+
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        """
+        float32 matrix, shape (len(texts), dim), rows in input order.
+
+        Only cache misses (deduplicated) reach the provider.
+        """
+        keys, vectors, misses = self._lookup(texts)
+        fresh = self._embed_batch(list(misses.values())) if misses else []
+        return self._assemble(keys, vectors, misses, fresh)
+
+    async def embed_batch_async(self, texts: list[str]) -> np.ndarray:
+        """
+        embed_batch for async callers; providers may override _embed_batch_async.
+
+        Callers owning the event loop close its API clients with
+        llm.close_async_openai_clients() before the loop ends.
+        """
+        keys, vectors, misses = self._lookup(texts)
+        fresh = await self._embed_batch_async(list(misses.values())) if misses else []
+        return self._assemble(keys, vectors, misses, fresh)
+
+    async def _embed_batch_async(
+        self, texts: list[str]
+    ) -> np.ndarray | list[list[float]]:
+        """Default: the sync provider call on a worker thread."""
+        return await asyncio.to_thread(self._embed_batch, texts)
+
+    def _lookup(
+        self, texts: list[str]
+    ) -> tuple[list[str], list[np.ndarray | None], dict[str, str]]:
+        """Cache keys, cached vectors (None = miss), and misses as {key: text}."""
+        keys = [content_key(self.model_id, t) for t in texts]
+        vectors = self.cache.get_many(keys)
+        misses = {k: t for k, t, v in zip(keys, texts, vectors) if v is None}
+        return keys, vectors, misses
+
+    def _assemble(
+        self,
+        keys: list[str],
+        vectors: list[np.ndarray | None],
+        misses: dict[str, str],
+        fresh: np.ndarray | list[list[float]],
+    ) -> np.ndarray:
+        """Cache the freshly embedded misses and stack all rows in input order."""
+        embedded = {k: _as_float32(e) for k, e in zip(misses, fresh)}
+        if embedded:
+            self.cache.set_many(embedded)
+        rows = [embedded[k] if v is None else v for k, v in zip(keys, vectors)]
+
+        logger.info("embedding_cache", hits=len(keys) - len(misses), misses=len(misses))
+        if not rows:
+            return np.empty((0, settings.embedding_dimension), dtype=np.float32)
+        return np.stack(rows)
 
 
 class LocalEmbeddingService(BaseEmbeddingService):
     """Embeddings via sentence-transformers."""
 
-    def __init__(self, model_name: str | None = None):
+    def __init__(
+        self, model_name: str | None = None, cache: SemanticCache | None = None
+    ):
+        super().__init__(cache)
         self.model_name = model_name or settings.embedding_model_local
-        logger.info("loading_local_embedding_model", model=self.model_name)
-        self.model = SentenceTransformer(self.model_name)
+        self.model, self.precision = _load_st(
+            self.model_name,
+            int8=settings.embedding_local_int8,
+            fp16=settings.embedding_local_fp16,
+        )
+
+    @property
+    def model_id(self) -> str:
+        # int8/fp16 vectors differ slightly from fp32: keep their cache entries apart.
+        suffix = "" if self.precision == "fp32" else f":{self.precision}"
+        return f"local:{self.model_name}{suffix}"
 
-    def embed(self, text: str) -> list[float]:
-        return self.model.encode(text, normalize_embeddings=True).tolist()
+    def _embed(self, text: str) -> np.ndarray:
+        return self.model.encode(text, normalize_embeddings=True, convert_to_numpy=True)
 
-    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+    def _embed_batch(self, texts: list[str]) -> np.ndarray:
         logger.info("embedding_batch_local", count=len(texts))
         return self.model.encode(
             texts,
             normalize_embeddings=True,
+            convert_to_numpy=True,
             batch_size=32,
             show_progress_bar=True,
-        ).tolist()
+        )
+
+
+class Model2VecEmbeddingService(BaseEmbeddingService):
+    """
+    Static embeddings via model2vec: a token-vector lookup and mean, no forward pass.
+
+    Vectors have the distilled model's dimension (256 for potion-base-8M), so set
+    EMBEDDING_DIMENSION to match.
+    """
+
+    def __init__(
+        self, model_name: str | None = None, cache: SemanticCache | None = None
+    ):
+        super().__init__(cache)
+        self.model_name = model_name or settings.model2vec_model
+        logger.info("loading_model2vec_model", model=self.model_name)
+        self.model = StaticModel.from_pretrained(self.model_name, normalize=True)
+
+    @property
+    def model_id(self) -> str:
+        return f"model2vec:{self.model_name}"
+
+    def _embed(self, text: str) -> np.ndarray:
+        return self.model.encode([text])[0]
+
+    def _embed_batch(self, texts: list[str]) -> np.ndarray:
+        logger.info("embedding_batch_model2vec", count=len(texts))
+        return self.model.encode(texts, batch_size=1024)
 
 
 class OpenRouterEmbeddingService(BaseEmbeddingService):
     """Embeddings via OpenRouter (OpenAI-compatible API)."""
 
-    def __init__(self):
-        self.client = OpenAI(
-            base_url=settings.openrouter_base_url,
-            api_key=settings.openrouter_api_key,
+    def __init__(self, cache: SemanticCache | None = None):
+        super().__init__(cache)
+        self.client = get_openai_client(
+            settings.openrouter_base_url, settings.openrouter_api_key
         )
         self.model = settings.embedding_model_openrouter
 
-    def embed(self, text: str) -> list[float]:
+    @property
+    def model_id(self) -> str:
+        return f"openrouter:{self.model}"
+
+    def _embed(self, text: str) -> list[float]:
         response = self.client.embeddings.create(model=self.model, input=text)
         return response.data[0].embedding
 
-    def embed_batch(self, texts: list[str], batch_size: int = 100) -> list[list[float]]:
+    def _embed_batch(
+        self, texts: list[str], batch_size: int = 100
+    ) -> list[list[float]]:
         logger.info("embedding_batch_openrouter", count=len(texts))
         all_embeddings = []
         for i in range(0, len(texts), batch_size):
@@ -73,16 +211,73 @@ class OpenRouterEmbeddingService(BaseEmbeddingService):
             all_embeddings.extend([item.embedding for item in response.data])
         return all_embeddings
 
+    async def _embed_batch_async(
+        self, texts: list[str], batch_size: int = 100
+    ) -> list[list[float]]:
+        """Sub-batches requested concurrently on AsyncOpenAI, results in order."""
+        logger.info("embedding_batch_openrouter_async", count=len(texts))
+        client = get_async_openai_client(
+            settings.openrouter_base_url, settings.openrouter_api_key
+        )
+        responses = await asyncio.gather(
+            *(
+                client.embeddings.create(
+                    model=self.model, input=texts[i : i + batch_size]
+                )
+                for i in range(0, len(texts), batch_size)
+            )
+        )
+        return [item.embedding for response in responses for item in response.data]
+
+
+@lru_cache(maxsize=2)
+def _load_st(
+    model_name: str, int8: bool, fp16: bool
+) -> tuple[SentenceTransformer, str]:
+    """
+    Load (once per process) a SentenceTransformer at the requested precision.
+
+    CUDA: fp16 weights if asked. CPU: int8 dynamic quantization if asked.
+    Vectors are cast back to float32 by embed/embed_batch (pgvector stores float4).
+
+    :return: (model, precision) with precision in {"fp32", "fp16", "int8"}
+    """
+    logger.info("loading_local_embedding_model", model=model_name)
+    if torch.cuda.is_available():
+        if not fp16:
+            return SentenceTransformer(model_name, device="cuda"), "fp32"
+        # Inference is bandwidth-bound: half-width weights/activations ~2x throughput.
+        model = SentenceTransformer(
+            model_name, device="cuda", model_kwargs={"torch_dtype": torch.float16}
+        )
+        logger.info("local_embedding_model_half_precision", dtype="float16")
+        return model, "fp16"
+
+    model = SentenceTransformer(model_name, device="cpu")
+    if not int8:
+        return model, "fp32"
+    # Dynamic int8 quantization of the Linear layers (weights int8, activations
+    # quantized per batch): uses the VNNI int8 GEMM kernels on CPU.
+    model = torch.ao.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+    logger.info("local_embedding_model_quantized", dtype="qint8")
+    return model, "int8"
+
 
+@lru_cache(maxsize=1)
 def create_embedding_service() -> BaseEmbeddingService:
-    """Return the configured provider."""
+    """Return the configured provider (one instance per process)."""
     provider = settings.embedding_provider.lower()
 
     if provider == "local":
         return LocalEmbeddingService()
+    elif provider == "model2vec":
+        return Model2VecEmbeddingService()
     elif provider == "openrouter":
         return OpenRouterEmbeddingService()
     else:
         raise ValueError(
-            f"Unknown embedding provider: {provider}. Use 'local' or 'openrouter'."
+            f"Unknown embedding provider: {provider}. "
+            "Use 'local', 'model2vec' or 'openrouter'."
         )
@@ -2,10 +2,14 @@
 LLM client via OpenRouter (OpenAI-compatible API).
 """
 
-import json
+import asyncio
+import weakref
+from functools import lru_cache
 from typing import Type, TypeVar
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+from openai.types.chat import ChatCompletion, ChatCompletionMessageParam
 from pydantic import BaseModel, ValidationError
 
 from src.config.settings import settings
@@ -16,11 +20,27 @@ logger = get_logger(__name__)
 T = TypeVar("T", bound=BaseModel)
 
 
+@lru_cache(maxsize=4)
+def get_openai_client(base_url: str, api_key: str) -> OpenAI:
+    """
+    Shared OpenAI client per (base_url, api_key), used for LLM and embedding calls.
+
+    One keep-alive pool sized for the reranker's concurrent calls, so TLS
+    handshakes and pool setup aren't repeated per client instance.
+    """
+    return OpenAI(
+        base_url=base_url,
+        api_key=api_key,
+        http_client=DefaultHttpxClient(
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+        ),
+    )
+
+
 class LLMClient:
     def __init__(self):
-        self.client = OpenAI(
-            base_url=settings.openrouter_base_url,
-            api_key=settings.openrouter_api_key,
+        self.client = get_openai_client(
+            settings.openrouter_base_url, settings.openrouter_api_key
         )
 
     def call(self, prompt: str, system: str | None = None) -> str:
@@ -37,13 +57,19 @@ class LLMClient:
         prompt: str,
         response_model: Type[T],
         system: str | None = None,
+        max_tokens: int | None = None,
+        stop: list[str] | None = None,
+        reasoning: bool = True,
     ) -> T:
         """
         Call LLM with JSON mode and validate against a Pydantic model.
 
         response_format=json_object guarantees valid JSON from the API.
         Pydantic validates the schema. Malformed output never reaches the application
-        logic.
+        logic. max_tokens / stop cap decoding for callers that expect short replies;
+        output cut off mid-JSON fails validation like any malformed reply.
+        Thinking models count reasoning tokens against max_tokens, so tight caps
+        should come with reasoning=False (OpenRouter's reasoning.enabled).
         """
         messages = self._build_messages(prompt, system)
 
@@ -51,29 +77,130 @@ class LLMClient:
             model=settings.llm_model,
             messages=messages,
             response_format={"type": "json_object"},
+            **self._decoding_limits(max_tokens, stop, reasoning),
         )
-        raw = response.choices[0].message.content
-
-        try:
-            parsed = json.loads(raw)
-        except json.JSONDecodeError as e:
-            logger.error("json_parse_failed", raw=raw[:300], error=str(e))
-            raise ValueError(f"LLM returned invalid JSON: {e}")
-
-        try:
-            return response_model.model_validate(parsed)
-        except ValidationError:
-            logger.error(
-                "response_validation_failed",
-                model=response_model.__name__,
-                parsed=parsed,
-            )
-            raise
+        return _parse_structured(_reply_content(response, max_tokens), response_model)
 
     @staticmethod
-    def _build_messages(prompt: str, system: str | None) -> list[dict]:
-        messages = []
+    def _build_messages(
+        prompt: str, system: str | None
+    ) -> list[ChatCompletionMessageParam]:
+        messages: list[ChatCompletionMessageParam] = []
         if system:
             messages.append({"role": "system", "content": system})
         messages.append({"role": "user", "content": prompt})
         return messages
+
+    @staticmethod
+    def _decoding_limits(
+        max_tokens: int | None, stop: list[str] | None, reasoning: bool = True
+    ) -> dict:
+        """Only the limits actually set (providers may reject explicit nulls)."""
+        limits: dict = {}
+        if max_tokens is not None:
+            limits["max_tokens"] = max_tokens
+        if stop:
+            limits["stop"] = stop
+        if not reasoning:
+            limits["extra_body"] = {"reasoning": {"enabled": False}}
+        return limits
+
+
+# httpx async pools are bound to the loop that opened them, and each asyncio.run()
+# gets a fresh loop: async clients are shared per running loop. Open connections
+# keep the loop alive, so whoever runs the loop closes them with
+# close_async_openai_clients() before it ends.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_openai_client(base_url: str, api_key: str) -> AsyncOpenAI:
+    """
+    AsyncOpenAI shared per (running loop, base_url, api_key).
+
+    Call close_async_openai_clients() on the same loop when done with it.
+    """
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    key = (base_url, api_key)
+    if key not in clients:
+        clients[key] = AsyncOpenAI(
+            base_url=base_url,
+            api_key=api_key,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+            ),
+        )
+    return clients[key]
+
+
+async def close_async_openai_clients() -> None:
+    """Close the running loop's async clients (their connections and sockets)."""
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    await asyncio.gather(*(client.close() for client in clients.values()))
+
+
+class AsyncLLMClient:
+    """
+    Async counterpart of LLMClient (AsyncOpenAI). Lets many calls share one
+    event loop instead of one blocked thread per in-flight request.
+    """
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        return get_async_openai_client(
+            settings.openrouter_base_url, settings.openrouter_api_key
+        )
+
+    async def call_structured(
+        self,
+        prompt: str,
+        response_model: Type[T],
+        system: str | None = None,
+        max_tokens: int | None = None,
+        stop: list[str] | None = None,
+        reasoning: bool = True,
+    ) -> T:
+        """Async LLMClient.call_structured."""
+        response = await self.client.chat.completions.create(
+            model=settings.llm_model,
+            messages=LLMClient._build_messages(prompt, system),
+            response_format={"type": "json_object"},
+            **LLMClient._decoding_limits(max_tokens, stop, reasoning),
+        )
+        return _parse_structured(_reply_content(response, max_tokens), response_model)
+
+
+def _reply_content(response: ChatCompletion, max_tokens: int | None) -> str:
+    """The reply text; a reply cut off by max_tokens is logged (it will not parse)."""
+    choice = response.choices[0]
+    if choice.finish_reason == "length":
+        logger.warning(
+            "llm_reply_truncated",
+            finish_reason=choice.finish_reason,
+            max_tokens=max_tokens,
+            completion_tokens=(
+                response.usage.completion_tokens if response.usage else None
+            ),
+        )
+    return choice.message.content or ""
+
+
+def _parse_structured(raw: str, response_model: Type[T]) -> T:
+    """
+    Parse JSON-mode output straight into response_model (one pass, no dict).
+
+    Invalid JSON raises ValueError; schema mismatches raise ValidationError.
+    """
+    try:
+        return response_model.model_validate_json(raw)
+    except ValidationError as e:
+        if any(err["type"] == "json_invalid" for err in e.errors()):
+            logger.error("json_parse_failed", raw=raw[:300], error=str(e))
+            raise ValueError(f"LLM returned invalid JSON: {e}")
+        logger.error(
+            "response_validation_failed",
+            model=response_model.__name__,
+            raw=raw[:300],
+        )
+        raise
@@ -0,0 +1,18 @@
+"""Helpers shared by the prompt modules."""
+
+
+def split_template(template: str, *fields: str) -> list[str]:
+    """
+    Literal parts of a str.format template around the given fields, in order.
+
+    Prompts are pre-split once at import, so rendering is a concatenation
+    instead of a str.format parse per call. Each field must occur exactly once;
+    "{{" / "}}" escapes are undone.
+    """
+    parts = []
+    rest = template
+    for field in fields:
+        head, rest = rest.split("{" + field + "}")
+        parts.append(head)
+    parts.append(rest)
+    return [p.replace("{{", "{").replace("}}", "}") for p in parts]
@@ -0,0 +1,22 @@
+"""
+int8 vector quantization, shared by the pgvector storage layer and the
+in-process SIMD similarity kernels.
+
+Cosine is scale-invariant, so quantizing each row to [-127, 127] with its own
+scale preserves the ranking while cutting memory 4x.
+"""
+
+import numpy as np
+
+
+def quantize_i8(vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-row int8 quantization.
+
+    :return: (int8 matrix, float32 per-row scales); row ≈ int8_row * scale
+    """
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    max_abs = np.abs(vectors).max(axis=1, keepdims=True)
+    scales = np.maximum(max_abs, np.float32(1e-12)) / np.float32(127)
+    quantized = np.clip(np.rint(vectors / scales), -127, 127).astype(np.int8)
+    return quantized, scales.ravel()
@@ -0,0 +1,80 @@
+import struct
+
+import numpy as np
+from psycopg2.extensions import adapt
+
+from src.db.connection import _VectorLiteral, vec_literal
+from src.db.models import ArticleCreate
+from src.db.repository import _PGCOPY_HEADER, _copy_binary
+
+
+def _read_copy_binary(data: bytes) -> list[tuple[str, np.ndarray, np.ndarray, float]]:
+    """Decode the rows written by _copy_binary (the server-side view of the stream)."""
+    assert data.startswith(_PGCOPY_HEADER)
+    pos = len(_PGCOPY_HEADER)
+    rows = []
+    while True:
+        (fields,) = struct.unpack_from(">h", data, pos)
+        pos += 2
+        if fields == -1:
+            break
+        assert fields == 4
+
+        (size,) = struct.unpack_from(">i", data, pos)
+        text = data[pos + 4 : pos + 4 + size].decode()
+        pos += 4 + size
+
+        size, dim, unused = struct.unpack_from(">ihh", data, pos)
+        assert (size, unused) == (4 + 4 * dim, 0)
+        vec = np.frombuffer(data, dtype=">f4", count=dim, offset=pos + 8)
+        pos += 4 + size
+
+        (size,) = struct.unpack_from(">i", data, pos)
+        quantized = np.frombuffer(data, dtype=np.int8, count=size, offset=pos + 4)
+        pos += 4 + size
+
+        size, scale = struct.unpack_from(">if", data, pos)
+        assert size == 4
+        pos += 8
+
+        rows.append((text, vec, quantized, scale))
+    assert pos == len(data)
+    return rows
+
+
+def test_copy_binary_round_trip():
+    rng = np.random.default_rng(0)
+    articles = [
+        ArticleCreate(text=text, embedding=rng.standard_normal(8))
+        for text in ["Spurs win", "Tab\there, newline\nthere", "Zürich — ünïcode"]
+    ]
+
+    rows = _read_copy_binary(_copy_binary(articles).getvalue())
+
+    assert [r[0] for r in rows] == [a.text for a in articles]
+    for article, (_, vec, quantized, scale) in zip(articles, rows):
+        np.testing.assert_array_equal(vec, article.embedding)
+        np.testing.assert_allclose(
+            quantized * scale, article.embedding, atol=scale / 2 + 1e-6
+        )
+
+
+def test_copy_binary_empty():
+    assert _read_copy_binary(_copy_binary([]).getvalue()) == []
+
+
+def test_vector_literal_round_trips_fp32():
+    rng = np.random.default_rng(0)
+    vec = np.concatenate(
+        [
+            np.array([0.1, -2.5e-7, 3.0, 123456.79], dtype=np.float32),
+            rng.standard_normal(1536).astype(np.float32),
+        ]
+    )
+
+    literal = vec_literal(vec)
+
+    assert literal.startswith("[0.100000001,-2.49999999e-07,3,123456.789,")
+    parsed = np.array(literal[1:-1].split(","), dtype=np.float32)
+    np.testing.assert_array_equal(parsed, vec)
+    assert _VectorLiteral(vec).getquoted() == adapt(literal).getquoted()
@@ -0,0 +1,40 @@
+import pytest
+
+from src.ingestion.pipeline import IngestionPipeline
+
+ROWS = [
+    "Spurs confirm Bergvall ankle sprain.[1]",
+    '**Key details:**\n- Fee: €10-15 million\n- Medical: "next week"[2]',
+    "Rennes sign Szymanski from Fenerbahce.",
+]
+
+
+def _write_csv(path, rows):
+    quoted = ['"' + row.replace('"', '""') + '"' for row in rows]
+    path.write_text("text\n" + "\n".join(quoted) + "\n", encoding="utf-8")
+
+
+def test_read_texts_multiline_values_across_blocks(tmp_path):
+    csv_path = tmp_path / "news.csv"
+    _write_csv(csv_path, ROWS * 20)
+
+    # Small blocks put many block edges inside quoted multi-line values.
+    texts = IngestionPipeline._read_texts(csv_path, block_size=256)
+
+    assert (
+        texts
+        == [
+            "Spurs confirm Bergvall ankle sprain.",
+            'Key details: - Fee: €10-15 million - Medical: "next week"',
+            "Rennes sign Szymanski from Fenerbahce.",
+        ]
+        * 20
+    )
+
+
+def test_read_texts_requires_text_column(tmp_path):
+    csv_path = tmp_path / "news.csv"
+    csv_path.write_text("body\nhello\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="'text' column"):
+        IngestionPipeline._read_texts(csv_path)
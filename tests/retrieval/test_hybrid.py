@@ -0,0 +1,98 @@
+import random
+from collections import defaultdict
+
+import pytest
+
+from src.db.models import ArticleHit
+from src.retrieval.hybrid import HybridRetriever
+
+RRF_K = 60
+
+
+@pytest.fixture
+def retriever(monkeypatch):
+    monkeypatch.setattr("src.retrieval.hybrid.settings.rrf_k", RRF_K)
+    # A small weight table so the growth path runs too.
+    monkeypatch.setattr("src.retrieval.hybrid.settings.max_top_k", 3)
+    return HybridRetriever(embedding_service=object())
+
+
+def reference_fusion(semantic, keyword, top_k):
+    """The original dict-and-sorted RRF: ties keep first-seen order."""
+    scores = defaultdict(float)
+    fields = defaultdict(dict)
+    for rank, hit in enumerate(semantic, 1):
+        scores[hit.id] += 1.0 / (RRF_K + rank)
+        fields[hit.id].update(semantic_rank=rank, semantic_score=hit.score)
+    for rank, hit in enumerate(keyword, 1):
+        scores[hit.id] += 1.0 / (RRF_K + rank)
+        fields[hit.id].update(keyword_rank=rank, keyword_score=hit.score)
+    ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:top_k]
+    return [(article_id, score, fields[article_id]) for article_id, score in ranked]
+
+
+def assert_matches_reference(retriever, semantic, keyword, top_k):
+    fused = retriever._fuse_rrf(semantic, keyword, top_k)
+    expected = reference_fusion(semantic, keyword, top_k)
+
+    assert [f.id for f in fused] == [e[0] for e in expected]
+    for f, (_, score, fields) in zip(fused, expected):
+        assert f.rrf_score == pytest.approx(score, rel=1e-6)
+        assert f.semantic_rank == fields.get("semantic_rank")
+        assert f.semantic_score == fields.get("semantic_score")
+        assert f.keyword_rank == fields.get("keyword_rank")
+        assert f.keyword_score == fields.get("keyword_score")
+
+
+def test_ties_keep_first_seen_order(retriever):
+    # Every id is found by one search only, at matching ranks: all pairs tie.
+    # Ids run against rank order so an id-ordered tie-break would show.
+    semantic = [ArticleHit(9, 0.9), ArticleHit(5, 0.8), ArticleHit(1, 0.7)]
+    keyword = [ArticleHit(8, 3.0), ArticleHit(4, 2.0), ArticleHit(2, 1.0)]
+
+    fused = retriever._fuse_rrf(semantic, keyword, top_k=6)
+
+    assert [f.id for f in fused] == [9, 8, 5, 4, 1, 2]
+    assert_matches_reference(retriever, semantic, keyword, top_k=6)
+    # The top_k cut falls inside a tie: the semantic hit wins it.
+    assert [f.id for f in retriever._fuse_rrf(semantic, keyword, top_k=3)] == [9, 8, 5]
+
+
+def test_overlapping_ids_sum_both_ranks(retriever):
+    semantic = [ArticleHit(1, 0.9), ArticleHit(2, 0.8), ArticleHit(3, 0.7)]
+    keyword = [ArticleHit(3, 5.0), ArticleHit(4, 4.0), ArticleHit(1, 3.0)]
+
+    fused = retriever._fuse_rrf(semantic, keyword, top_k=4)
+
+    assert [f.id for f in fused] == [1, 3, 2, 4]
+    assert (fused[0].semantic_rank, fused[0].keyword_rank) == (1, 3)
+    assert (fused[0].semantic_score, fused[0].keyword_score) == (0.9, 3.0)
+    assert (fused[2].keyword_rank, fused[2].keyword_score) == (None, None)
+    assert (fused[3].semantic_rank, fused[3].semantic_score) == (None, None)
+    assert_matches_reference(retriever, semantic, keyword, top_k=4)
+
+
+@pytest.mark.parametrize(
+    "semantic, keyword",
+    [
+        ([], []),
+        ([ArticleHit(7, 0.5), ArticleHit(3, 0.4)], []),
+        ([], [ArticleHit(7, 2.0), ArticleHit(3, 1.0)]),
+    ],
+)
+def test_empty_lists(retriever, semantic, keyword):
+    assert_matches_reference(retriever, semantic, keyword, top_k=5)
+
+
+def test_matches_reference_on_random_lists(retriever):
+    rng = random.Random(0)
+    for _ in range(500):
+        semantic = [
+            ArticleHit(i, rng.random())
+            for i in rng.sample(range(60), rng.randint(0, 20))
+        ]
+        keyword = [
+            ArticleHit(i, rng.random())
+            for i in rng.sample(range(60), rng.randint(0, 20))
+        ]
+        assert_matches_reference(retriever, semantic, keyword, rng.randint(1, 25))
@@ -0,0 +1,179 @@
+import asyncio
+import re
+
+import pytest
+
+from src.retrieval.models import RerankerBatchResponse, RerankerItem, RetrievalResult
+from src.retrieval.reranker import LLMReranker
+from src.services.cache import SemanticCache
+
+_CANDIDATE = re.compile(r"^\[(\d+)\]\n(.+)$", re.MULTILINE)
+
+
+class FakeLLM:
+    """
+    Scores each candidate in the prompt with score(text, position).
+
+    Positions are the prompt's 1-based [n] labels, as a real model would reply
+    with; score() returning None leaves the candidate out of the reply.
+    """
+
+    def __init__(self, score):
+        self.score = score
+        self.windows = []
+
+    def call_structured(self, prompt, response_model, **kwargs):
+        assert response_model is RerankerBatchResponse
+        listed = _CANDIDATE.findall(prompt.split("CANDIDATES:\n", 1)[1])
+        self.windows.append([text for _, text in listed])
+        items = []
+        for position, text in listed:
+            relevance = self.score(text, int(position))
+            if relevance is not None:
+                items.append(RerankerItem(id=int(position), relevance=relevance))
+        return RerankerBatchResponse(scores=items)
+
+
+class FakeAsyncLLM(FakeLLM):
+    async def call_structured(self, prompt, response_model, **kwargs):
+        return FakeLLM.call_structured(self, prompt, response_model, **kwargs)
+
+
+def candidates(n):
+    return [
+        RetrievalResult(id=100 + i, text=f"article {i}", rrf_score=0.01 * (n - i))
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def make_reranker(monkeypatch, tmp_path):
+    monkeypatch.setattr("src.retrieval.reranker.settings.reranker_batch_size", 4)
+    monkeypatch.setattr("src.retrieval.reranker.settings.reranker_window_stride", 2)
+    monkeypatch.setattr("src.retrieval.reranker.settings.reranker_max_workers", 1)
+    monkeypatch.setattr(
+        "src.retrieval.reranker.settings.reranker_dedup_threshold", None
+    )
+    monkeypatch.setattr(
+        "src.retrieval.reranker.settings.reranker_relevance_threshold", 0.5
+    )
+
+    def make(llm, namespace="reranker"):
+        return LLMReranker(
+            llm_client=llm,
+            async_llm_client=llm,
+            cache=SemanticCache(namespace, directory=tmp_path),
+        )
+
+    return make
+
+
+@pytest.mark.parametrize(
+    "n, expected",
+    [(0, []), (3, [0]), (4, [0]), (7, [0, 2, 3]), (10, [0, 2, 4, 6])],
+)
+def test_window_starts_cover_every_candidate(make_reranker, n, expected):
+    reranker = make_reranker(FakeLLM(lambda text, position: 1.0))
+
+    starts = reranker._window_starts(n)
+
+    assert starts == expected
+    covered = {i for s in starts for i in range(s, s + reranker.batch_size)}
+    assert covered >= set(range(n))
+
+
+def test_window_starts_clamp_stride_to_batch_size(make_reranker):
+    reranker = make_reranker(FakeLLM(lambda text, position: 1.0))
+    reranker.stride = 10
+
+    # Non-overlapping windows, the last one pulled back to end at n.
+    assert reranker._window_starts(9) == [0, 4, 5]
+
+
+def test_window_scores_map_positions_to_ids():
+    window = candidates(3)
+    response = RerankerBatchResponse(
+        scores=[
+            RerankerItem(id=2, relevance=0.8),
+            RerankerItem(id=1, relevance=0.3),
+            RerankerItem(id=0, relevance=0.9),
+            RerankerItem(id=4, relevance=0.9),
+        ]
+    )
+
+    scores = LLMReranker._window_scores(window, response)
+
+    # Out-of-range positions (0, 4) are ignored rather than misattributed.
+    assert set(scores) == {100, 101}
+    assert scores[101].id == 101 and scores[101].relevance == 0.8
+    assert scores[100].id == 100 and scores[100].relevance == 0.3
+
+
+def test_finish_keeps_best_score_from_overlapping_windows(make_reranker):
+    # Later positions score higher and windows slide forward, so a candidate
+    # seen by several windows scores best in the earliest one: the merge must
+    # keep the maximum, not the last score seen.
+    llm = FakeLLM(lambda text, position: 0.45 + 0.1 * position)
+    reranker = make_reranker(llm)
+
+    ranked = reranker.rerank("query", candidates(7))
+
+    assert llm.windows == [
+        ["article 0", "article 1", "article 2", "article 3"],
+        ["article 2", "article 3", "article 4", "article 5"],
+        ["article 3", "article 4", "article 5", "article 6"],
+    ]
+    scores = {r.id: r.relevance_score for r in ranked}
+    assert scores == pytest.approx(
+        {
+            100: 0.55,  # position 1
+            101: 0.65,  # position 2
+            102: 0.75,  # positions 3, 1
+            103: 0.85,  # positions 4, 2, 1
+            104: 0.75,  # positions 3, 2
+            105: 0.85,  # positions 4, 3
+            106: 0.85,  # position 4
+        }
+    )
+    assert [r.relevance_score for r in ranked] == sorted(
+        (r.relevance_score for r in ranked), reverse=True
+    )
+
+
+def test_finish_applies_threshold_and_falls_back_for_omitted(make_reranker):
+    def score(text, position):
+        if text == "article 1":
+            return None  # model skipped it
+        return 0.2 if text == "article 2" else 0.9
+
+    reranker = make_reranker(FakeLLM(score))
+    items = candidates(3)
+
+    ranked = reranker.rerank("query", items)
+
+    by_id = {r.id: r for r in ranked}
+    assert set(by_id) == {100, 101}  # article 2 is below the threshold
+    assert by_id[100].relevance_score == 0.9
+    assert by_id[101].relevance_reason == "reranker_fallback"
+    assert by_id[101].relevance_score == items[1].rrf_score
+
+
+def test_rerank_reuses_cached_scores(make_reranker):
+    llm = FakeLLM(lambda text, position: 0.9)
+    reranker = make_reranker(llm)
+
+    first = reranker.rerank("query", candidates(3))
+    second = reranker.rerank("query", candidates(3))
+
+    assert len(llm.windows) == 1
+    assert second == first
+
+
+def test_rerank_async_matches_rerank(make_reranker):
+    def score(text, position):
+        return 0.45 + 0.1 * position
+
+    expected = make_reranker(FakeLLM(score)).rerank("query", candidates(7))
+    reranker = make_reranker(FakeAsyncLLM(score), namespace="reranker-async")
+
+    assert asyncio.run(reranker.rerank_async("query", candidates(7))) == expected